@@ -0,0 +1,8 @@
+import sys
+sys.path.append(".")
+from src.main import app
+from src.models import db, MemberStatus
+with app.app_context():
+    updated = MemberStatus.backfill_current_ranks()
+    db.session.commit()
+    print(f"✅ Graduações atuais copiadas para {updated} membros")
@@ -0,0 +1,155 @@
+"""
+Benchmark do motor de recorrência
+Sistema Ki Aikido
+
+Compara o antigo laço dia a dia de generate_recurring_occurrences com o
+RecurrenceRule (forma fechada) em séries diárias e semanais de vários anos,
+verificando também que ambos produzem exatamente as mesmas datas.
+
+Uso (a partir de backend/):
+    python benchmarks/recurrence_benchmark.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import calendar
+import itertools
+import timeit
+
+from src.utils.recurrence import RecurrenceRule, DEFAULT_MAX_OCCURRENCES, DEFAULT_HORIZON
+
+
+def legacy_dates(event):
+    """Cópia do laço original (dia a dia / intervalo a intervalo)"""
+    current_date = event.start_datetime
+    max_occurrences = event.recurrence_count if event.recurrence_count else DEFAULT_MAX_OCCURRENCES
+    end_limit = event.recurrence_end_date if event.recurrence_end_date else (current_date + DEFAULT_HORIZON)
+    dates = []
+
+    if event.recurrence_pattern == 'weekly' and event.recurrence_days:
+        allowed_days = [int(d) for d in event.recurrence_days.split(',')]
+        while len(dates) < max_occurrences and current_date <= end_limit:
+            if current_date.weekday() in allowed_days:
+                dates.append(current_date)
+            current_date += timedelta(days=1)
+        return dates
+
+    while len(dates) < max_occurrences and current_date <= end_limit:
+        should_include = False
+        if event.recurrence_pattern == 'daily':
+            should_include = True
+        elif event.recurrence_pattern == 'weekly':
+            should_include = current_date.weekday() == event.start_datetime.weekday()
+        elif event.recurrence_pattern == 'monthly':
+            should_include = current_date.day == event.start_datetime.day
+        elif event.recurrence_pattern == 'yearly':
+            should_include = (current_date.month, current_date.day) == (event.start_datetime.month, event.start_datetime.day)
+
+        if should_include:
+            dates.append(current_date)
+
+        if event.recurrence_pattern == 'daily':
+            current_date += timedelta(days=event.recurrence_interval)
+        elif event.recurrence_pattern == 'weekly':
+            current_date += timedelta(weeks=event.recurrence_interval)
+        elif event.recurrence_pattern == 'monthly':
+            month = current_date.month + event.recurrence_interval
+            year = current_date.year
+            while month > 12:
+                month -= 12
+                year += 1
+            try:
+                current_date = current_date.replace(year=year, month=month)
+            except ValueError:
+                last_day = calendar.monthrange(year, month)[1]
+                current_date = current_date.replace(year=year, month=month, day=last_day)
+        elif event.recurrence_pattern == 'yearly':
+            current_date = current_date.replace(year=current_date.year + event.recurrence_interval)
+    return dates
+
+
+def engine_dates(event):
+    """Mesmas regras de limite usadas por generate_recurring_occurrences"""
+    max_occurrences = None if event.recurrence_count else DEFAULT_MAX_OCCURRENCES
+    end_limit = event.recurrence_end_date or (event.start_datetime + DEFAULT_HORIZON)
+    return RecurrenceRule.from_event(event).between(event.start_datetime, end_limit, limit=max_occurrences)
+
+
+def make_event(pattern, start, years=None, interval=1, days=None, count=None):
+    return SimpleNamespace(
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1, minutes=30),
+        recurrence_pattern=pattern,
+        recurrence_interval=interval,
+        recurrence_days=days,
+        recurrence_end_date=start + timedelta(days=365 * years) if years else None,
+        recurrence_count=count
+    )
+
+
+def check_equivalence():
+    """Compara as duas implementações em uma grade de combinações"""
+    starts = [
+        datetime(2025, 10, 21, 19, 0),
+        datetime(2024, 1, 31, 7, 30),
+        datetime(2024, 2, 29, 10, 0),
+        datetime(2025, 3, 30, 18, 0),
+        datetime(2025, 12, 28, 9, 15),
+    ]
+    cases = 0
+    for start, pattern, interval, days, years, count in itertools.product(
+        starts,
+        ('daily', 'weekly', 'monthly', 'yearly'),
+        (1, 2, 3),
+        (None, '1,3', '0,6', '2,4', str(starts[0].weekday())),
+        (None, 1, 6),
+        (None, 7, 250),
+    ):
+        if days and pattern != 'weekly':
+            continue
+        event = make_event(pattern, start, years=years, interval=interval, days=days, count=count)
+        try:
+            expected = legacy_dates(event)
+        except ValueError:
+            # O laço antigo quebrava em séries anuais iniciadas em 29/02
+            continue
+        actual = engine_dates(event)
+        assert expected == actual, (pattern, start, interval, days, years, count, expected[:5], actual[:5])
+        cases += 1
+    return cases
+
+
+def run_benchmark():
+    start = datetime(2025, 10, 21, 19, 0)
+    scenarios = [
+        ('daily, 10 anos', make_event('daily', start, years=10, count=10000)),
+        ('weekly ter/qui, 10 anos', make_event('weekly', start, years=10, days='1,3', count=10000)),
+        ('weekly seg-sex, 5 anos', make_event('weekly', start, years=5, days='0,1,2,3,4', count=10000)),
+        ('weekly simples, 10 anos', make_event('weekly', start, years=10, count=10000)),
+        ('daily a cada 2 dias, 3 anos', make_event('daily', start, years=3, interval=2, count=10000)),
+    ]
+
+    print(f"{'cenário':32} {'ocorrências':>12} {'legado (ms)':>12} {'motor (ms)':>12} {'ganho':>8}")
+    for label, event in scenarios:
+        occurrences = len(engine_dates(event))
+        runs = 20
+        legacy_ms = timeit.timeit(lambda: legacy_dates(event), number=runs) / runs * 1000
+        engine_ms = timeit.timeit(lambda: engine_dates(event), number=runs) / runs * 1000
+        print(f"{label:32} {occurrences:>12} {legacy_ms:>12.3f} {engine_ms:>12.3f} {legacy_ms / engine_ms:>7.1f}x")
+
+    # Janela distante: o motor salta direto para a janela pedida
+    event = make_event('weekly', start, years=10, days='1,3')
+    rule = RecurrenceRule.from_event(event)
+    window_start = datetime(2034, 3, 1)
+    window_ms = timeit.timeit(lambda: rule.between(window_start, window_start + timedelta(days=31)), number=1000)
+    print(f"\njanela de 1 mês em 2034 (weekly ter/qui): {window_ms:.3f} ms por consulta")
+
+
+if __name__ == '__main__':
+    total = check_equivalence()
+    print(f"Equivalência verificada em {total} combinações\n")
+    run_benchmark()
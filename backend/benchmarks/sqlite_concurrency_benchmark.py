@@ -0,0 +1,157 @@
+"""
+Benchmark de concorrência do SQLite
+Sistema Ki Aikido
+
+Executa a mesma carga (escritores gravando transações curtas, como uploads
+e edições de eventos, e leitores fazendo consultas de listagem) em um banco
+temporário com as configurações padrão do SQLite e com o perfil de produção
+(src/utils/sqlite_tuning.py), e compara vazão, latência das leituras e
+erros de lock.
+
+Uso (a partir de backend/):
+    python benchmarks/sqlite_concurrency_benchmark.py [segundos] [escritores] [leitores]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import NullPool
+
+from src.utils.sqlite_tuning import apply_sqlite_profile
+
+# Mesmos padrões das configurações SQLITE_* de src/main.py
+PRODUCTION_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+ROWS = 20000
+DOJOS = 6
+
+
+def make_engine(path, profile):
+    # NullPool: uma conexão nova por operação, como várias threads do servidor
+    engine = create_engine(f'sqlite:///{path}', poolclass=NullPool)
+    apply_sqlite_profile(engine, profile)
+    return engine
+
+
+def seed(path):
+    engine = make_engine(path, {})
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE student (id INTEGER PRIMARY KEY, dojo_id INTEGER NOT NULL, '
+            'name VARCHAR(200) NOT NULL, notes TEXT, updated_at DATETIME)'
+        )
+        connection.exec_driver_sql('CREATE INDEX ix_student_dojo_name ON student (dojo_id, name)')
+        connection.exec_driver_sql(
+            'INSERT INTO student (id, dojo_id, name, notes, updated_at) VALUES (?, ?, ?, ?, ?)',
+            [(i, i % DOJOS + 1, f'Aluno {i:05d}', 'x' * 200, '2025-01-01 00:00:00') for i in range(1, ROWS + 1)]
+        )
+    engine.dispose()
+
+
+def run_workload(path, profile, seconds, writers, readers):
+    engine = make_engine(path, profile)
+    stop = threading.Event()
+    results = {'writes': 0, 'reads': 0, 'lock_errors': 0, 'read_latencies': [], 'write_latencies': []}
+    lock = threading.Lock()
+
+    def writer():
+        rng = random.Random()
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with engine.begin() as connection:
+                    for _ in range(5):
+                        connection.exec_driver_sql(
+                            'UPDATE student SET notes = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                            ('y' * rng.randint(50, 300), rng.randint(1, ROWS))
+                        )
+            except OperationalError:
+                with lock:
+                    results['lock_errors'] += 1
+                continue
+            elapsed = time.perf_counter() - started
+            with lock:
+                results['writes'] += 1
+                results['write_latencies'].append(elapsed)
+
+    def reader():
+        rng = random.Random()
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.exec_driver_sql(
+                        'SELECT id, name, notes FROM student WHERE dojo_id = ? ORDER BY name LIMIT 50 OFFSET ?',
+                        (rng.randint(1, DOJOS), rng.randint(0, 500))
+                    ).fetchall()
+            except OperationalError:
+                with lock:
+                    results['lock_errors'] += 1
+                continue
+            elapsed = time.perf_counter() - started
+            with lock:
+                results['reads'] += 1
+                results['read_latencies'].append(elapsed)
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return results
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def run_benchmark(seconds=5, writers=4, readers=8):
+    workdir = tempfile.mkdtemp(prefix='sqlite-bench-')
+    try:
+        template = os.path.join(workdir, 'template.db')
+        seed(template)
+
+        print(f"{writers} escritores, {readers} leitores, {seconds}s por perfil, {ROWS} linhas\n")
+        print(f"{'perfil':10} {'escritas/s':>11} {'leituras/s':>11} {'leitura p50':>12} {'leitura p99':>12} "
+              f"{'escrita p99':>12} {'erros lock':>11}")
+        for label, profile in (('padrão', {}), ('produção', PRODUCTION_PROFILE)):
+            path = os.path.join(workdir, f'{label}.db')
+            shutil.copy(template, path)
+            result = run_workload(path, profile, seconds, writers, readers)
+            print(f"{label:10} {result['writes'] / seconds:>11.1f} {result['reads'] / seconds:>11.1f} "
+                  f"{percentile(result['read_latencies'], 0.5) * 1000:>10.2f}ms "
+                  f"{percentile(result['read_latencies'], 0.99) * 1000:>10.2f}ms "
+                  f"{percentile(result['write_latencies'], 0.99) * 1000:>10.2f}ms "
+                  f"{result['lock_errors']:>11}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:4]]
+    run_benchmark(*args)
@@ -0,0 +1,7 @@
+import sys
+sys.path.append(".")
+from src.main import app
+from src.utils.materializer import run_materializer
+with app.app_context():
+    result = run_materializer()
+    print(f"✅ Ocorrências materializadas: {result['inserted']} inseridas, {result['pruned']} removidas, {result['reminder_fires']} disparos de aviso")
@@ -0,0 +1,45 @@
+import argparse
+import os
+import sys
+sys.path.append(".")
+
+# As migrações são aplicadas aqui, não na importação do app
+os.environ['AUTO_MIGRATE'] = 'false'
+
+from src.main import app
+from src.migrations import MIGRATIONS, applied_versions, run_migrations
+from src.migrations.explain import explain_report
+
+
+def print_report(title, report):
+    print(f"\n{title}")
+    for name, plan in report:
+        print(f"  {name}")
+        for line in plan:
+            print(f"    {line}")
+
+
+parser = argparse.ArgumentParser(description='Aplica as migrações pendentes do banco de dados')
+parser.add_argument('--status', action='store_true', help='lista as migrações e sai')
+parser.add_argument('--explain', action='store_true', help='mostra o plano das consultas principais antes e depois')
+args = parser.parse_args()
+
+with app.app_context():
+    applied = applied_versions()
+    if args.status:
+        for migration in MIGRATIONS:
+            mark = 'aplicada' if migration.VERSION in applied else 'pendente'
+            print(f"{migration.VERSION:04d} [{mark}] {migration.DESCRIPTION}")
+        sys.exit(0)
+
+    if args.explain:
+        print_report("Plano antes das migrações:", explain_report())
+
+    versions = run_migrations()
+    if versions:
+        print(f"✅ Migrações aplicadas: {', '.join(f'{version:04d}' for version in versions)}")
+    else:
+        print("✅ Banco de dados já está atualizado")
+
+    if args.explain:
+        print_report("Plano depois das migrações:", explain_report())
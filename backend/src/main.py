@@ -7,7 +7,7 @@ from flask import Flask, send_from_directory, jsonify
 from flask_cors import CORS
 from datetime import datetime
 import uuid
-from src.models import db, User, Dojo, Student, MemberStatus, MemberGraduation, MemberQualification, DocumentAttachment, Event, EventReminder, EventOccurrence
+from src.models import db, User, Dojo, Student, MemberStatus, MemberGraduation, MemberQualification, DocumentAttachment, Event, EventReminder, EventReminderFire, EventOccurrence
 from src.routes.auth import auth_bp
 from src.routes.students import students_bp
 from src.routes.dojos import dojos_bp
@@ -18,12 +18,18 @@ from src.routes.user import user_bp
 from src.routes.documents import documents_bp
 from src.routes.reports import reports_bp
 from src.routes.events import events_bp
+from src.routes.diagnostics import diagnostics_bp
+from src.utils.materializer import start_materializer
+from src.utils.reminders import refresh_reminder_fires, start_reminder_ticker
+from src.migrations import run_migrations
+from src.utils.sqlite_tuning import sqlite_profile, apply_sqlite_profile
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 
 # Configurações
 app.config['SECRET_KEY'] = 'ki-aikido-secret-key-2024'
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+# Caminho do banco relativo a backend/src (ou absoluto), como em .env.production.example
+app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), os.environ.get('DATABASE_PATH', os.path.join('database', 'app.db')))}"
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 # Configuração de uploads
@@ -31,6 +37,41 @@ app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(__file__), 'uploads',
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB
 app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'jpg', 'jpeg', 'png'}
 
+# Ocorrências de eventos recorrentes:
+# 'materialized' grava todas as ocorrências em event_occurrences;
+# 'virtual' calcula as ocorrências sob demanda e grava apenas exceções
+app.config['EVENT_OCCURRENCE_MODE'] = os.environ.get('EVENT_OCCURRENCE_MODE', 'materialized')
+
+# Materialização contínua (modo 'materialized'): séries com data final são
+# gravadas até o fim; nas séries abertas as escritas gravam apenas a janela
+# curta e o job periódico as estende até o horizonte. O job também remove
+# ocorrências sem alterações mais antigas que a retenção
+app.config['EVENT_WRITE_WINDOW_DAYS'] = int(os.environ.get('EVENT_WRITE_WINDOW_DAYS', 60))
+app.config['EVENT_MATERIALIZE_HORIZON_DAYS'] = int(os.environ.get('EVENT_MATERIALIZE_HORIZON_DAYS', 180))
+app.config['EVENT_RETENTION_DAYS'] = int(os.environ.get('EVENT_RETENTION_DAYS', 365))
+app.config['EVENT_MATERIALIZER_INTERVAL'] = int(os.environ.get('EVENT_MATERIALIZER_INTERVAL', 3600))  # segundos, 0 desabilita
+
+# Stream SSE (/api/events/stream): intervalo dos comentários de keepalive em segundos
+app.config['EVENT_STREAM_KEEPALIVE'] = int(os.environ.get('EVENT_STREAM_KEEPALIVE', 25))
+
+# Caminho rápido opcional: listagens (alunos, membros, eventos, documentos)
+# lidas como tuplas de colunas em vez de objetos ORM ('true' habilita)
+app.config['LIST_ROW_SERIALIZERS'] = os.environ.get('LIST_ROW_SERIALIZERS', 'false').lower() == 'true'
+
+# Migrações pendentes aplicadas na inicialização; com 'false' rode
+# 'python migrate.py' a cada atualização
+app.config['AUTO_MIGRATE'] = os.environ.get('AUTO_MIGRATE', 'true').lower() == 'true'
+
+# Perfil de PRAGMAs do SQLite aplicado a cada conexão ('false' usa os padrões do SQLite)
+app.config['SQLITE_TUNING'] = os.environ.get('SQLITE_TUNING', 'true').lower() == 'true'
+app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+app.config['SQLITE_BUSY_TIMEOUT'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # ms
+app.config['SQLITE_CACHE_SIZE'] = int(os.environ.get('SQLITE_CACHE_SIZE', -20000))  # negativo = KiB
+app.config['SQLITE_MMAP_SIZE'] = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # bytes
+app.config['SQLITE_TEMP_STORE'] = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY')
+app.config['SQLITE_FOREIGN_KEYS'] = os.environ.get('SQLITE_FOREIGN_KEYS', 'ON')
+
 # Configuração de sessão
 app.config['SESSION_COOKIE_SECURE'] = False  # Para desenvolvimento
 app.config['SESSION_COOKIE_HTTPONLY'] = True
@@ -54,12 +95,15 @@ app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(documents_bp, url_prefix='/api')
 app.register_blueprint(reports_bp, url_prefix='/api')
 app.register_blueprint(events_bp, url_prefix='/api')
+app.register_blueprint(diagnostics_bp, url_prefix='/api')
 
 # Criar diretório de uploads se não existir
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # Inicializar banco de dados
 db.init_app(app)
+with app.app_context():
+    apply_sqlite_profile(db.engine, sqlite_profile(app.config))
 
 @app.route('/api/health')
 def health_check():
@@ -76,6 +120,10 @@ def init_database():
         # Criar todas as tabelas
         db.create_all()
         
+        # Aplicar colunas e índices adicionados depois da criação das tabelas
+        if app.config['AUTO_MIGRATE']:
+            run_migrations()
+        
         # Verificar se já existem dados
         if User.query.first() is not None:
             return  # Dados já existem
@@ -324,6 +372,8 @@ def init_database():
                 )
                 db.session.add(reminder)
         
+        db.session.flush()
+        refresh_reminder_fires(Event.query.all())
         db.session.commit()
         
         print("Banco de dados inicializado com sucesso!")
@@ -369,5 +419,9 @@ def serve(path):
             }), 200
 
 if __name__ == '__main__':
+    # Com o reloader do modo debug, só o processo filho atende requisições
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_materializer(app)
+        start_reminder_ticker(app)
     app.run(host='0.0.0.0', port=5000, debug=True)
 
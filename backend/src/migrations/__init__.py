@@ -0,0 +1,115 @@
+"""
+Migrações versionadas do esquema
+Sistema Ki Aikido
+
+db.create_all() só cria tabelas que ainda não existem; colunas e índices
+adicionados depois a tabelas existentes são aplicados por migrações. Cada
+migração é um módulo com VERSION, DESCRIPTION e upgrade(), listado em
+MIGRATIONS na ordem de aplicação. As versões aplicadas ficam registradas em
+schema_migrations, então cada migração roda uma única vez por banco.
+
+O DDL do SQLite é executado fora da sessão (ALTER TABLE/CREATE INDEX), por
+isso upgrade() deve ser idempotente: se falhar no meio, a versão não é
+registrada e a próxima execução repete a migração inteira.
+"""
+
+from datetime import datetime
+
+from src.models import db
+from src.migrations import (
+    m0001_baseline, m0002_production_indexes, m0003_student_search, m0004_event_search,
+    m0005_student_name_indexes
+)
+
+# Ordem de aplicação
+MIGRATIONS = [
+    m0001_baseline,
+    m0002_production_indexes,
+    m0003_student_search,
+    m0004_event_search,
+    m0005_student_name_indexes,
+]
+
+schema_migrations = db.Table(
+    'schema_migrations',
+    db.Column('version', db.Integer, primary_key=True),
+    db.Column('description', db.String(200), nullable=False),
+    db.Column('applied_at', db.DateTime, nullable=False)
+)
+
+
+def applied_versions():
+    """Versões já registradas em schema_migrations"""
+    schema_migrations.create(db.engine, checkfirst=True)
+    return set(db.session.execute(db.select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations():
+    """Migrações ainda não aplicadas, na ordem de aplicação"""
+    applied = applied_versions()
+    return [migration for migration in MIGRATIONS if migration.VERSION not in applied]
+
+
+def run_migrations():
+    """
+    Aplica as migrações pendentes (usado na inicialização e por migrate.py)
+
+    Returns:
+        Lista das versões aplicadas nesta execução
+
+    Raises:
+        Exception: Erro da migração que falhou (as anteriores ficam registradas)
+    """
+    applied = []
+    for migration in pending_migrations():
+        try:
+            migration.upgrade()
+            db.session.execute(db.insert(schema_migrations).values(
+                version=migration.VERSION,
+                description=migration.DESCRIPTION,
+                applied_at=datetime.utcnow()
+            ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        applied.append(migration.VERSION)
+    return applied
+
+
+def add_missing_columns(model, column_names):
+    """
+    Adiciona (ALTER TABLE) as colunas do modelo que ainda não existem no banco
+
+    Returns:
+        Lista dos nomes das colunas adicionadas
+    """
+    table = model.__table__
+    existing_columns = {column['name'] for column in db.inspect(db.engine).get_columns(table.name)}
+    added = []
+    for name in column_names:
+        if name in existing_columns:
+            continue
+        column = table.columns[name]
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(
+                f'ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(db.engine.dialect)}'
+            )
+        added.append(name)
+    return added
+
+
+def create_indexes(models, names):
+    """
+    Cria os índices declarados nos modelos que ainda não existem no banco
+
+    Args:
+        models: Modelos que declaram os índices em __table_args__
+        names: Nomes dos índices a criar
+
+    Raises:
+        KeyError: Índice não declarado em nenhum dos modelos
+    """
+    indexes = {index.name: index for model in models for index in model.__table__.indexes}
+    for name in names:
+        indexes[name].create(db.engine, checkfirst=True)
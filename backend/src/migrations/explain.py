@@ -0,0 +1,60 @@
+"""
+Plano de execução (EXPLAIN QUERY PLAN) das consultas mais frequentes
+Sistema Ki Aikido
+
+Usado por migrate.py --explain para comparar os planos antes e depois das
+migrações: SCAN indica leitura da tabela inteira; SEARCH ... USING INDEX,
+acesso pelo índice.
+"""
+
+from src.models import db
+
+# (nome, SQL) com valores fixos, no formato gerado pelas rotas
+HOT_QUERIES = [
+    ('Alunos do dojo (listagem)',
+     "SELECT id FROM student WHERE dojo_id = 1 ORDER BY name"),
+    ('Alunos por cursor (página seguinte)',
+     "SELECT id FROM student WHERE (name, id) > ('Maria', 10) ORDER BY name, id LIMIT 51"),
+    ('Busca de alunos por prefixo (lookup)',
+     "SELECT id FROM student WHERE name_normalized >= 'ana' AND name_normalized < 'ana\U0010ffff' "
+     "ORDER BY name_normalized LIMIT 10"),
+    ('Membros por graduação de Aikido',
+     "SELECT id FROM member_status ORDER BY aikido_rank_level DESC"),
+    ('Graduações do membro',
+     "SELECT id FROM member_graduation WHERE member_status_id = 1 AND is_current = 1"),
+    ('Qualificações do membro',
+     "SELECT id FROM member_qualification WHERE member_status_id = 1"),
+    ('Eventos do dojo',
+     "SELECT id FROM events WHERE dojo_id = 1"),
+    ('Eventos no intervalo (calendário)',
+     "SELECT id FROM events WHERE start_datetime <= '2025-02-01' AND end_datetime >= '2025-01-01'"),
+    ('Eventos por cursor (página seguinte)',
+     "SELECT id FROM events WHERE (start_datetime, id) > ('2025-01-01', 10) ORDER BY start_datetime, id LIMIT 51"),
+    ('Ocorrências da série',
+     "SELECT id FROM event_occurrences WHERE event_id = 1 AND occurrence_date >= '2025-01-01'"),
+    ('Avisos do evento',
+     "SELECT id FROM event_reminders WHERE event_id = 1"),
+    ('Documentos de uma graduação',
+     "SELECT id FROM document_attachment WHERE document_type = 'graduation' AND related_id = 1"),
+    ('Documento pelo caminho do arquivo',
+     "SELECT id FROM document_attachment WHERE file_path = 'arquivo.pdf'"),
+]
+
+
+def explain_report():
+    """
+    Plano de cada consulta de HOT_QUERIES no banco atual
+
+    Returns:
+        Lista de pares (nome, linhas do plano); consultas que não rodam no
+        esquema atual (ex: coluna ainda não criada) retornam a mensagem de erro
+    """
+    report = []
+    with db.engine.connect() as connection:
+        for name, sql in HOT_QUERIES:
+            try:
+                plan = [row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}')]
+            except Exception as e:
+                plan = [f'erro: {e.__cause__ or e}']
+            report.append((name, plan))
+    return report
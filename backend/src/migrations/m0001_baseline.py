@@ -0,0 +1,44 @@
+"""
+Colunas e índices criados antes das migrações versionadas
+
+Bancos novos já recebem tudo de db.create_all(); em bancos antigos adiciona
+as colunas derivadas (graduação atual em member_status, nome normalizado
+do aluno) com seus valores e os índices das consultas de listagem.
+"""
+
+from src.models import db, Student, MemberStatus, MemberGraduation, Event, EventReminder, EventReminderFire, EventOccurrence
+from src.utils.reminders import refresh_reminder_fires
+
+VERSION = 1
+DESCRIPTION = 'Colunas derivadas e índices das listagens'
+
+
+def upgrade():
+    from src.migrations import add_missing_columns, create_indexes
+
+    rank_columns = [name for columns in MemberStatus.RANK_COLUMNS.values() for name in columns]
+    if add_missing_columns(MemberStatus, rank_columns):
+        MemberStatus.backfill_current_ranks()
+        db.session.commit()
+
+    if add_missing_columns(Student, ['name_normalized']):
+        Student.backfill_normalized_names()
+        db.session.commit()
+
+    create_indexes(
+        [Student, MemberStatus, MemberGraduation, Event, EventOccurrence],
+        [
+            'ix_student_name_normalized',
+            'ix_student_dojo_name_normalized',
+            'ix_member_status_aikido_rank_level',
+            'ix_member_status_toitsudo_rank_level',
+            'ix_member_graduation_member_current',
+            'ix_events_start_end',
+            'ix_event_occurrences_event_date',
+        ]
+    )
+
+    # Índice de disparo dos avisos em bancos criados antes dele
+    if EventReminderFire.query.first() is None and EventReminder.query.first() is not None:
+        refresh_reminder_fires(Event.query.all())
+        db.session.commit()
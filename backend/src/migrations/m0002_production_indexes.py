@@ -0,0 +1,32 @@
+"""
+Índices das chaves estrangeiras e filtros usados pelas rotas
+
+- member_qualification.member_status_id: qualificações do membro (perfil, resumo)
+- events.dojo_id: eventos do dojo (listagem e calendário de usuários de dojo)
+- event_reminders.event_id: avisos do evento (detalhe, índice de disparo)
+- document_attachment (document_type, related_id): documentos de uma graduação/qualificação/membro
+- document_attachment.file_path: verificação de acesso ao servir arquivos
+
+student.dojo_id, member_graduation.member_status_id, events.start_datetime e
+event_occurrences.event_id já são prefixo de índices compostos da migração 1.
+"""
+
+from src.models import MemberQualification, Event, EventReminder, DocumentAttachment
+
+VERSION = 2
+DESCRIPTION = 'Índices de produção (chaves estrangeiras e documentos)'
+
+
+def upgrade():
+    from src.migrations import create_indexes
+
+    create_indexes(
+        [MemberQualification, Event, EventReminder, DocumentAttachment],
+        [
+            'ix_member_qualification_member_status',
+            'ix_events_dojo',
+            'ix_event_reminders_event',
+            'ix_document_attachment_type_related',
+            'ix_document_attachment_file_path',
+        ]
+    )
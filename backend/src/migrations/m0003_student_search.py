@@ -0,0 +1,66 @@
+"""
+Índice de busca textual (FTS5) de alunos e membros
+
+student_search tem uma linha por aluno (rowid = student.id) com nome,
+email, número de registro do aluno e número de registro do membro. Os
+triggers mantêm o índice em qualquer escrita, inclusive atualizações em
+lote feitas fora do ORM. Sem FTS5 no SQLite a migração não cria nada e as
+buscas continuam por ilike.
+"""
+
+from src.models import db
+from src.utils.search import STUDENT_SEARCH, fts5_supported
+
+VERSION = 3
+DESCRIPTION = 'Busca textual de alunos e membros (FTS5)'
+
+_REGISTERED_NUMBER = '(SELECT registered_number FROM member_status WHERE student_id = {id})'
+
+STATEMENTS = [
+    STUDENT_SEARCH.create_statement(),
+
+    f"""CREATE TRIGGER IF NOT EXISTS student_search_insert AFTER INSERT ON student BEGIN
+        INSERT INTO student_search (rowid, name, email, registration_number, registered_number)
+        VALUES (new.id, new.name, new.email, new.registration_number, {_REGISTERED_NUMBER.format(id='new.id')});
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS student_search_update AFTER UPDATE OF name, email, registration_number ON student BEGIN
+        UPDATE student_search SET name = new.name, email = new.email, registration_number = new.registration_number
+        WHERE rowid = new.id;
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS student_search_delete AFTER DELETE ON student BEGIN
+        DELETE FROM student_search WHERE rowid = old.id;
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS member_search_insert AFTER INSERT ON member_status BEGIN
+        UPDATE student_search SET registered_number = new.registered_number WHERE rowid = new.student_id;
+    END""",
+
+    f"""CREATE TRIGGER IF NOT EXISTS member_search_update AFTER UPDATE OF registered_number, student_id ON member_status BEGIN
+        UPDATE student_search SET registered_number = {_REGISTERED_NUMBER.format(id='old.student_id')}
+        WHERE rowid = old.student_id;
+        UPDATE student_search SET registered_number = new.registered_number WHERE rowid = new.student_id;
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS member_search_delete AFTER DELETE ON member_status BEGIN
+        UPDATE student_search SET registered_number = NULL WHERE rowid = old.student_id;
+    END""",
+]
+
+
+def upgrade():
+    if not fts5_supported():
+        print("SQLite sem FTS5: busca de alunos continua por ilike")
+        return
+
+    for statement in STATEMENTS:
+        db.session.execute(db.text(statement))
+
+    # Reconstrói o índice a partir das tabelas (idempotente)
+    db.session.execute(db.text('DELETE FROM student_search'))
+    db.session.execute(db.text("""
+        INSERT INTO student_search (rowid, name, email, registration_number, registered_number)
+        SELECT student.id, student.name, student.email, student.registration_number, member_status.registered_number
+        FROM student LEFT JOIN member_status ON member_status.student_id = student.id
+    """))
@@ -0,0 +1,47 @@
+"""
+Índice de busca textual (FTS5) de eventos
+
+event_search tem uma linha por evento (rowid = events.id) com título,
+descrição e local, mantida por triggers. Sem FTS5 no SQLite a migração não
+cria nada e as buscas continuam por ilike.
+"""
+
+from src.models import db
+from src.utils.search import EVENT_SEARCH, fts5_supported
+
+VERSION = 4
+DESCRIPTION = 'Busca textual de eventos (FTS5)'
+
+STATEMENTS = [
+    EVENT_SEARCH.create_statement(),
+
+    """CREATE TRIGGER IF NOT EXISTS event_search_insert AFTER INSERT ON events BEGIN
+        INSERT INTO event_search (rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS event_search_update AFTER UPDATE OF title, description, location ON events BEGIN
+        UPDATE event_search SET title = new.title, description = new.description, location = new.location
+        WHERE rowid = new.id;
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS event_search_delete AFTER DELETE ON events BEGIN
+        DELETE FROM event_search WHERE rowid = old.id;
+    END""",
+]
+
+
+def upgrade():
+    if not fts5_supported():
+        print("SQLite sem FTS5: busca de eventos continua por ilike")
+        return
+
+    for statement in STATEMENTS:
+        db.session.execute(db.text(statement))
+
+    # Reconstrói o índice a partir da tabela (idempotente)
+    db.session.execute(db.text('DELETE FROM event_search'))
+    db.session.execute(db.text("""
+        INSERT INTO event_search (rowid, title, description, location)
+        SELECT id, title, description, location FROM events
+    """))
@@ -0,0 +1,18 @@
+"""
+Índices da ordenação por nome das listagens de alunos e membros
+
+A paginação por cursor filtra (name, id) depois da última linha; com o
+índice a página é uma busca de intervalo já na ordem certa, sem ler e
+ordenar a tabela inteira. (dojo_id, name) atende os usuários de dojo.
+"""
+
+from src.models import Student
+
+VERSION = 5
+DESCRIPTION = 'Índices de ordenação por nome de alunos'
+
+
+def upgrade():
+    from src.migrations import create_indexes
+
+    create_indexes([Student], ['ix_student_name', 'ix_student_dojo_name'])
@@ -1,9 +1,14 @@
 from src.models.user import db
+from src.utils.fields import wants, pick
 from datetime import datetime
 
 class DocumentAttachment(db.Model):
     """Tabela para documentos e fotos anexadas (certificados, fotos de membros)"""
     __tablename__ = 'document_attachment'
+    __table_args__ = (
+        db.Index('ix_document_attachment_type_related', 'document_type', 'related_id'),
+        db.Index('ix_document_attachment_file_path', 'file_path'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     file_name = db.Column(db.String(255), nullable=False)  # Nome original do arquivo
@@ -25,6 +30,12 @@ class DocumentAttachment(db.Model):
     uploaded_by = db.relationship('User', backref='uploaded_documents', foreign_keys=[uploaded_by_user_id])
     verified_by = db.relationship('User', foreign_keys=[verified_by_user_id])
     
+    # Chaves de to_dict() que dependem de relacionamentos (ver src/utils/fields.py)
+    RELATED_FIELDS = {
+        'uploaded_by_name': ('uploaded_by',),
+        'verified_by_name': ('verified_by',)
+    }
+    
     # Constantes para tipos de documentos
     DOCUMENT_TYPES = {
         'graduation': 'Certificado de Graduação',
@@ -47,8 +58,8 @@ class DocumentAttachment(db.Model):
         else:  # graduation ou qualification
             return mime_type in cls.ALLOWED_DOCUMENT_TYPES
     
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None):
+        data = {
             'id': self.id,
             'file_name': self.file_name,
             'file_path': self.file_path,
@@ -56,16 +67,22 @@ class DocumentAttachment(db.Model):
             'file_size': self.file_size,
             'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None,
             'uploaded_by_user_id': self.uploaded_by_user_id,
-            'uploaded_by_name': self.uploaded_by.name if self.uploaded_by else None,
             'document_type': self.document_type,
             'document_type_display': self.DOCUMENT_TYPES.get(self.document_type, self.document_type),
             'related_id': self.related_id,
             'is_verified': self.is_verified,
             'verified_at': self.verified_at.isoformat() if self.verified_at else None,
             'verified_by_user_id': self.verified_by_user_id,
-            'verified_by_name': self.verified_by.name if self.verified_by else None,
             'verification_notes': self.verification_notes
         }
+        
+        if wants(fields, 'uploaded_by_name'):
+            data['uploaded_by_name'] = self.uploaded_by.name if self.uploaded_by else None
+        
+        if wants(fields, 'verified_by_name'):
+            data['verified_by_name'] = self.verified_by.name if self.verified_by else None
+        
+        return pick(data, fields)
     
     def verify(self, user_id, notes=None):
         """Marca documento como verificado"""
@@ -19,15 +19,55 @@ class Dojo(db.Model):
     def __repr__(self):
         return f'<Dojo {self.name}>'
 
-    def to_dict(self):
-        # Calcular membros ativos (estudantes com member_status ativo)
+    @classmethod
+    def member_counts(cls, dojo_ids=None):
+        """
+        Conta estudantes por dojo e status de membro em uma única consulta
+        
+        Args:
+            dojo_ids: Lista de IDs de dojo (None = todos)
+        
+        Returns:
+            Dicionário {dojo_id: {'total', 'active', 'inactive', 'pending'}}
+        """
+        from src.models.student import Student
         from src.models.member_status import MemberStatus
-        active_members = 0
-        if self.students:
-            for student in self.students:
-                member_status = MemberStatus.query.filter_by(student_id=student.id).first()
-                if member_status and member_status.current_status == 'active':
-                    active_members += 1
+        
+        query = db.session.query(
+            Student.dojo_id,
+            MemberStatus.current_status,
+            db.func.count(Student.id)
+        ).outerjoin(MemberStatus, MemberStatus.student_id == Student.id)
+        
+        if dojo_ids is not None:
+            query = query.filter(Student.dojo_id.in_(dojo_ids))
+        
+        counts = {}
+        for dojo_id, status, count in query.group_by(Student.dojo_id, MemberStatus.current_status).all():
+            dojo_counts = counts.setdefault(dojo_id, cls._empty_counts())
+            dojo_counts['total'] += count
+            if status in dojo_counts:
+                dojo_counts[status] += count
+        return counts
+    
+    @staticmethod
+    def _empty_counts():
+        return {'total': 0, 'active': 0, 'inactive': 0, 'pending': 0}
+    
+    def _counts(self, counts):
+        """Contagens deste dojo (a partir do resultado de member_counts, ou consultando)"""
+        if counts is None:
+            counts = Dojo.member_counts([self.id])
+        return counts.get(self.id, Dojo._empty_counts())
+
+    def to_dict(self, counts=None):
+        """
+        Converte o dojo para dicionário
+        
+        Args:
+            counts: Resultado de Dojo.member_counts() já calculado para a listagem
+        """
+        dojo_counts = self._counts(counts)
         
         return {
             'id': self.id,
@@ -38,34 +78,18 @@ class Dojo(db.Model):
             'responsible_instructor': self.responsible_instructor,
             'registration_number': self.registration_number,
             'is_active': self.is_active,
-            'student_count': len(self.students) if self.students else 0,
-            'active_members': active_members,
+            'student_count': dojo_counts['total'],
+            'active_members': dojo_counts['active'],
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
-    def get_stats(self):
+    def get_stats(self, counts=None):
         """Retorna estatísticas do dojo"""
-        from src.models.member_status import MemberStatus
-        
-        # Contar estudantes por status em member_status
-        active_count = 0
-        inactive_count = 0
-        pending_count = 0
-        
-        for student in self.students:
-            member_status = MemberStatus.query.filter_by(student_id=student.id).first()
-            if member_status:
-                if member_status.current_status == 'active':
-                    active_count += 1
-                elif member_status.current_status == 'inactive':
-                    inactive_count += 1
-                elif member_status.current_status == 'pending':
-                    pending_count += 1
+        dojo_counts = self._counts(counts)
         
         return {
-            'total_students': len(self.students),
-            'active_students': active_count,
-            'pending_students': pending_count,
-            'inactive_students': inactive_count
+            'total_students': dojo_counts['total'],
+            'active_students': dojo_counts['active'],
+            'pending_students': dojo_counts['pending'],
+            'inactive_students': dojo_counts['inactive']
         }
-
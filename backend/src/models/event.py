@@ -1,9 +1,14 @@
 from src.models.user import db
+from src.utils.fields import wants, pick
 from datetime import datetime
 
 class Event(db.Model):
     """Modelo para eventos do calendário"""
     __tablename__ = 'events'
+    __table_args__ = (
+        db.Index('ix_events_start_end', 'start_datetime', 'end_datetime'),
+        db.Index('ix_events_dojo', 'dojo_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -52,17 +57,22 @@ class Event(db.Model):
     creator = db.relationship('User', foreign_keys=[created_by], backref='created_events')
     parent_event = db.relationship('Event', remote_side=[id], backref='occurrences')
     reminders = db.relationship('EventReminder', backref='event', cascade='all, delete-orphan')
+    reminder_fires = db.relationship('EventReminderFire', backref='event', cascade='all, delete-orphan')
     
-    def to_dict(self):
-        """Converte o evento para dicionário"""
-        return {
+    # Chaves de to_dict() que dependem de relacionamentos (ver src/utils/fields.py)
+    RELATED_FIELDS = {
+        'dojo_name': ('dojo',)
+    }
+    
+    def to_dict(self, fields=None):
+        """Converte o evento para dicionário (fields: chaves a gerar, None = todas)"""
+        data = {
             'id': self.id,
             'title': self.title,
             'description': self.description,
             'category': self.category,
             'event_type': self.event_type,
             'dojo_id': self.dojo_id,
-            'dojo_name': self.dojo.name if self.dojo else None,
             'start_datetime': self.start_datetime.isoformat() if self.start_datetime else None,
             'end_datetime': self.end_datetime.isoformat() if self.end_datetime else None,
             'all_day': self.all_day,
@@ -83,11 +93,19 @@ class Event(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        
+        if wants(fields, 'dojo_name'):
+            data['dojo_name'] = self.dojo.name if self.dojo else None
+        
+        return pick(data, fields)
 
 
 class EventReminder(db.Model):
     """Modelo para avisos/lembretes de eventos"""
     __tablename__ = 'event_reminders'
+    __table_args__ = (
+        db.Index('ix_event_reminders_event', 'event_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
@@ -118,9 +136,31 @@ class EventReminder(db.Model):
         }
 
 
+class EventReminderFire(db.Model):
+    """Índice de disparo dos avisos: um registro por aviso e ocorrência do evento"""
+    __tablename__ = 'event_reminder_fires'
+    __table_args__ = (
+        db.Index('ix_event_reminder_fires_start_fire', 'event_start', 'fire_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    reminder_id = db.Column(db.Integer, db.ForeignKey('event_reminders.id'), nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
+    dojo_id = db.Column(db.Integer, nullable=True)  # cópia de events.dojo_id para o filtro por dojo
+    
+    # Início do evento (ou da ocorrência) e momento em que o aviso passa a ser exibido
+    event_start = db.Column(db.DateTime, nullable=False)
+    fire_at = db.Column(db.DateTime, nullable=False)
+    
+    reminder = db.relationship('EventReminder', backref=db.backref('fires', cascade='all, delete-orphan'))
+
+
 class EventOccurrence(db.Model):
     """Modelo para ocorrências de eventos recorrentes (cache para performance)"""
     __tablename__ = 'event_occurrences'
+    __table_args__ = (
+        db.Index('ix_event_occurrences_event_date', 'event_id', 'occurrence_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
@@ -146,6 +186,25 @@ class EventOccurrence(db.Model):
     # Relacionamento
     event = db.relationship('Event', backref=db.backref('cached_occurrences', cascade='all, delete-orphan'))
     
+    @classmethod
+    def virtual(cls, event, occurrence_date):
+        """Cria uma ocorrência calculada (não persistida) de um evento recorrente"""
+        return cls(
+            event_id=event.id,
+            series_id=event.series_id,
+            occurrence_date=occurrence_date,
+            end_datetime=occurrence_date + (event.end_datetime - event.start_datetime),
+            status='active'
+        )
+    
+    @property
+    def is_exception(self):
+        """Indica se a ocorrência difere do evento pai (suspensa, cancelada ou sobrescrita)"""
+        return bool(
+            self.status != 'active' or self.suspension_reason or self.override_title
+            or self.override_description or self.override_location
+        )
+    
     def to_dict(self):
         """Converte a ocorrência para dicionário"""
         return {
@@ -4,6 +4,9 @@ from datetime import datetime
 class MemberGraduation(db.Model):
     """Tabela para histórico de graduações dos membros"""
     __tablename__ = 'member_graduation'
+    __table_args__ = (
+        db.Index('ix_member_graduation_member_current', 'member_status_id', 'is_current'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_status_id = db.Column(db.Integer, db.ForeignKey('member_status.id'), nullable=False)
@@ -104,6 +107,8 @@ class MemberGraduation(db.Model):
             grad.is_current = False
         
         self.is_current = True
+        if self.member_status:
+            self.member_status.set_current_rank(self.discipline, self)
         db.session.commit()
     
     def to_dict(self):
@@ -4,6 +4,9 @@ from datetime import datetime
 class MemberQualification(db.Model):
     """Tabela para qualificações especiais dos membros"""
     __tablename__ = 'member_qualification'
+    __table_args__ = (
+        db.Index('ix_member_qualification_member_status', 'member_status_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_status_id = db.Column(db.Integer, db.ForeignKey('member_status.id'), nullable=False)
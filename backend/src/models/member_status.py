@@ -1,9 +1,14 @@
 from src.models.user import db
+from src.utils.fields import wants, pick
 from datetime import datetime
 
 class MemberStatus(db.Model):
     """Tabela para informações de status organizacional dos membros"""
     __tablename__ = 'member_status'
+    __table_args__ = (
+        db.Index('ix_member_status_aikido_rank_level', 'aikido_rank_level'),
+        db.Index('ix_member_status_toitsudo_rank_level', 'toitsudo_rank_level'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False, unique=True)
@@ -16,6 +21,13 @@ class MemberStatus(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Graduação atual por disciplina (cópia da linha is_current de member_graduation,
+    # mantida por update_current_graduation para listar, ordenar e filtrar sem JOIN)
+    aikido_rank_name = db.Column(db.String(100), nullable=True)
+    aikido_rank_level = db.Column(db.Integer, nullable=True)
+    toitsudo_rank_name = db.Column(db.String(100), nullable=True)
+    toitsudo_rank_level = db.Column(db.Integer, nullable=True)
+    
     # Relacionamentos
     student = db.relationship('Student', backref=db.backref('member_status', uselist=False))
     graduations = db.relationship('MemberGraduation', backref='member_status', lazy=True, cascade='all, delete-orphan')
@@ -35,6 +47,20 @@ class MemberStatus(db.Model):
         'pending': 'Pendente'
     }
     
+    # Chaves de to_dict() que dependem de relacionamentos (ver src/utils/fields.py)
+    RELATED_FIELDS = {
+        'student_name': ('student',),
+        'current_graduations': ('graduations',),
+        'total_graduations': ('graduations',),
+        'total_qualifications': ('qualifications',)
+    }
+    
+    # Colunas de graduação atual de cada disciplina
+    RANK_COLUMNS = {
+        'Shinshin Toitsu Aikido': ('aikido_rank_name', 'aikido_rank_level'),
+        'Shinshin Toitsudo': ('toitsudo_rank_name', 'toitsudo_rank_level')
+    }
+    
     def __repr__(self):
         return f'<MemberStatus {self.student.name if self.student else "Unknown"}>'
     
@@ -46,6 +72,95 @@ class MemberStatus(db.Model):
                 current_grads[grad.discipline] = grad
         return current_grads
     
+    def set_current_rank(self, discipline, graduation):
+        """
+        Atualiza as colunas de graduação atual de uma disciplina
+        
+        Args:
+            discipline: Disciplina da graduação
+            graduation: Graduação atual (MemberGraduation) ou None se não houver
+        """
+        columns = self.RANK_COLUMNS.get(discipline)
+        if not columns:
+            return
+        name_column, level_column = columns
+        setattr(self, name_column, graduation.rank_name if graduation else None)
+        setattr(self, level_column, graduation.rank_level if graduation else None)
+    
+    def get_current_ranks(self):
+        """Graduações atuais lidas das colunas desnormalizadas"""
+        ranks = {}
+        for discipline, (name_column, level_column) in self.RANK_COLUMNS.items():
+            rank_name = getattr(self, name_column)
+            if rank_name:
+                ranks[discipline] = {
+                    'rank_name': rank_name,
+                    'rank_level': getattr(self, level_column)
+                }
+        return ranks
+    
+    @staticmethod
+    def current_graduations_for(member_status_ids):
+        """
+        Graduações atuais de vários membros em uma única consulta
+        
+        Lê apenas as linhas is_current (sem carregar o histórico) e apenas
+        as colunas copiadas para member_status.
+        
+        Returns:
+            Dicionário {member_status_id: {discipline: linha com rank_name e rank_level}}
+        """
+        from src.models.member_graduation import MemberGraduation
+        
+        if not member_status_ids:
+            return {}
+        
+        rows = db.session.query(
+            MemberGraduation.member_status_id,
+            MemberGraduation.discipline,
+            MemberGraduation.rank_name,
+            MemberGraduation.rank_level
+        ).filter(
+            MemberGraduation.member_status_id.in_(member_status_ids),
+            MemberGraduation.is_current == True
+        ).order_by(MemberGraduation.id).all()
+        
+        current = {}
+        for row in rows:
+            current.setdefault(row.member_status_id, {})[row.discipline] = row
+        return current
+    
+    @classmethod
+    def backfill_current_ranks(cls, batch_size=500):
+        """
+        Recalcula as colunas de graduação atual de todos os membros a partir
+        das linhas is_current de member_graduation (em lote, sem carregar objetos)
+        
+        Returns:
+            Número de membros atualizados
+        """
+        values = {
+            member_status_id: {name: None for columns in cls.RANK_COLUMNS.values() for name in columns}
+            for member_status_id, in db.session.query(cls.id)
+        }
+        
+        member_status_ids = list(values)
+        for start in range(0, len(member_status_ids), batch_size):
+            current = cls.current_graduations_for(member_status_ids[start:start + batch_size])
+            for member_status_id, graduations in current.items():
+                for discipline, row in graduations.items():
+                    columns = cls.RANK_COLUMNS.get(discipline)
+                    if columns:
+                        values[member_status_id][columns[0]] = row.rank_name
+                        values[member_status_id][columns[1]] = row.rank_level
+        
+        if values:
+            db.session.execute(
+                db.update(cls),
+                [{'id': member_status_id, **ranks} for member_status_id, ranks in values.items()]
+            )
+        return len(values)
+    
     def get_highest_graduation(self, discipline):
         """Retorna a graduação mais alta em uma disciplina específica"""
         grads = [g for g in self.graduations if g.discipline == discipline]
@@ -53,13 +168,10 @@ class MemberStatus(db.Model):
             return None
         return max(grads, key=lambda x: x.rank_level or 0)
     
-    def to_dict(self):
-        current_grads = self.get_current_graduations()
-        
-        return {
+    def to_dict(self, fields=None):
+        data = {
             'id': self.id,
             'student_id': self.student_id,
-            'student_name': self.student.name if self.student else None,
             'registered_number': self.registered_number,
             'membership_date': self.membership_date.isoformat() if self.membership_date else None,
             'member_type': self.member_type,
@@ -69,19 +181,28 @@ class MemberStatus(db.Model):
             'photo_path': self.photo_path,
             'has_photo': bool(self.photo_path),
             'last_activity_year': self.last_activity_year,
-            'current_graduations': {
-                discipline: grad.to_dict() for discipline, grad in current_grads.items()
-            },
-            'total_graduations': len(self.graduations),
-            'total_qualifications': len(self.qualifications),
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        
+        if wants(fields, 'student_name'):
+            data['student_name'] = self.student.name if self.student else None
+        
+        if wants(fields, 'current_graduations'):
+            data['current_graduations'] = {
+                discipline: grad.to_dict() for discipline, grad in self.get_current_graduations().items()
+            }
+        
+        if wants(fields, 'total_graduations'):
+            data['total_graduations'] = len(self.graduations)
+        
+        if wants(fields, 'total_qualifications'):
+            data['total_qualifications'] = len(self.qualifications)
+        
+        return pick(data, fields)
     
     def to_summary(self):
-        """Retorna um resumo para listagens"""
-        current_grads = self.get_current_graduations()
-        
+        """Retorna um resumo para listagens (graduações atuais lidas das colunas, sem JOIN)"""
         return {
             'id': self.id,
             'student_id': self.student_id,
@@ -92,11 +213,5 @@ class MemberStatus(db.Model):
             'member_type_display': self.MEMBER_TYPES.get(self.member_type, self.member_type),
             'current_status': self.current_status,
             'current_status_display': self.STATUS_TYPES.get(self.current_status, self.current_status),
-            'current_graduations': {
-                discipline: {
-                    'rank_name': grad.rank_name,
-                    'rank_level': grad.rank_level
-                } for discipline, grad in current_grads.items()
-            }
+            'current_graduations': self.get_current_ranks()
         }
-
@@ -1,11 +1,22 @@
 from src.models.user import db
+from src.utils.fields import wants, pick
+from sqlalchemy.orm import validates
 from datetime import datetime
 import re
+import unicodedata
 
 class Student(db.Model):
+    __table_args__ = (
+        db.Index('ix_student_name_normalized', 'name_normalized'),
+        db.Index('ix_student_dojo_name_normalized', 'dojo_id', 'name_normalized'),
+        db.Index('ix_student_name', 'name'),
+        db.Index('ix_student_dojo_name', 'dojo_id', 'name'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     registration_number = db.Column(db.String(50), unique=True, nullable=False)
     name = db.Column(db.String(255), nullable=False)
+    name_normalized = db.Column(db.String(255), nullable=True)  # Nome sem acentos e em minúsculas (busca por prefixo)
     email = db.Column(db.String(255), unique=True, nullable=False)
     phone = db.Column(db.String(20), nullable=True)  # Campo telefone adicionado
     birth_date = db.Column(db.Date, nullable=False)
@@ -17,6 +28,13 @@ class Student(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Chaves de to_dict() que dependem de relacionamentos (ver src/utils/fields.py)
+    RELATED_FIELDS = {
+        'dojo_name': ('dojo',),
+        'status': ('member_status',),
+        'has_member_status': ('member_status',)
+    }
+
     def __repr__(self):
         return f'<Student {self.name}>'
 
@@ -40,6 +58,36 @@ class Student(db.Model):
         # Formato: KIA-DOJO_ID-NUMERO (ex: KIA-001-0001)
         return f"KIA-{dojo_id:03d}-{new_number:04d}"
 
+    @staticmethod
+    def normalize_name(value):
+        """Remove acentos, converte para minúsculas e normaliza espaços (ex: 'José  Álvares' -> 'jose alvares')"""
+        if not value:
+            return None
+        decomposed = unicodedata.normalize('NFKD', value)
+        folded = ''.join(char for char in decomposed if not unicodedata.combining(char))
+        return ' '.join(folded.casefold().split())
+
+    @validates('name')
+    def _update_name_normalized(self, key, value):
+        self.name_normalized = self.normalize_name(value)
+        return value
+
+    @classmethod
+    def backfill_normalized_names(cls):
+        """
+        Preenche name_normalized de todos os Cadastros Básicos (em lote)
+        
+        Returns:
+            Número de registros atualizados
+        """
+        values = [
+            {'id': student_id, 'name_normalized': cls.normalize_name(name)}
+            for student_id, name in db.session.query(cls.id, cls.name)
+        ]
+        if values:
+            db.session.execute(db.update(cls), values)
+        return len(values)
+
     @staticmethod
     def clean_registration_number(raw_number):
         """Limpa e padroniza números de registro da planilha"""
@@ -50,13 +98,13 @@ class Student(db.Model):
         cleaned = re.sub(r'\s+', '', raw_number.strip())
         return cleaned if cleaned else None
 
-    def to_dict(self):
-        # Busca o status do relacionamento member_status
-        member_status_obj = self.member_status if hasattr(self, 'member_status') else None
-        current_status = member_status_obj.current_status if member_status_obj else None
-        has_member_status = member_status_obj is not None
-        
-        return {
+    def to_dict(self, fields=None):
+        """
+        Args:
+            fields: Chaves a gerar (None = todas); relacionamentos só são
+                acessados se alguma chave dependente for pedida
+        """
+        data = {
             'id': self.id,
             'registration_number': self.registration_number,
             'name': self.name,
@@ -65,15 +113,23 @@ class Student(db.Model):
             'birth_date': self.birth_date.isoformat() if self.birth_date else None,
             'address': self.address,
             'dojo_id': self.dojo_id,
-            'dojo_name': self.dojo.name if self.dojo else None,
             'registration_date': self.registration_date.isoformat() if self.registration_date else None,
             'started_practicing_year': self.started_practicing_year,
-            'status': current_status,
-            'has_member_status': has_member_status,
             'notes': self.notes,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        
+        if wants(fields, 'dojo_name'):
+            data['dojo_name'] = self.dojo.name if self.dojo else None
+        
+        if wants(fields, 'status') or wants(fields, 'has_member_status'):
+            # Busca o status do relacionamento member_status
+            member_status_obj = self.member_status if hasattr(self, 'member_status') else None
+            data['status'] = member_status_obj.current_status if member_status_obj else None
+            data['has_member_status'] = member_status_obj is not None
+        
+        return pick(data, fields)
 
     def to_summary(self):
         """Retorna um resumo do Cadastro Básico para listagens"""
@@ -0,0 +1,58 @@
+"""
+Rotas de diagnóstico do servidor (apenas administradores)
+Sistema Ki Aikido
+"""
+
+import os
+import sqlite3
+
+from flask import Blueprint, jsonify, current_app
+from src.models import db
+from src.routes.auth import admin_required
+from src.utils.sqlite_tuning import sqlite_profile, read_pragmas
+
+diagnostics_bp = Blueprint('diagnostics', __name__)
+
+def _file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+@diagnostics_bp.route('/diagnostics/database', methods=['GET'])
+@admin_required
+def get_database_diagnostics():
+    """Perfil de PRAGMAs configurado e efetivo, e tamanho do banco SQLite"""
+    try:
+        if db.engine.dialect.name != 'sqlite':
+            return jsonify({'dialect': db.engine.dialect.name}), 200
+
+        configured = sqlite_profile(current_app.config)
+        with db.engine.connect() as connection:
+            effective = read_pragmas(connection)
+            page_size = connection.exec_driver_sql('PRAGMA page_size').scalar()
+            page_count = connection.exec_driver_sql('PRAGMA page_count').scalar()
+            freelist_count = connection.exec_driver_sql('PRAGMA freelist_count').scalar()
+
+        # Valores de enumeração voltam por nome; journal_mode volta em minúsculas
+        mismatches = [
+            pragma for pragma, value in configured.items()
+            if str(effective[pragma]).lower() != str(value).lower()
+        ]
+
+        path = db.engine.url.database
+        return jsonify({
+            'dialect': 'sqlite',
+            'sqlite_version': sqlite3.sqlite_version,
+            'tuning_enabled': bool(configured),
+            'configured': configured,
+            'effective': effective,
+            'mismatches': mismatches,
+            'storage': {
+                'page_size': page_size,
+                'page_count': page_count,
+                'freelist_count': freelist_count,
+                'database_bytes': _file_size(path) if path else 0,
+                'wal_bytes': _file_size(f'{path}-wal') if path else 0
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Erro ao ler diagnóstico do banco: {str(e)}'}), 500
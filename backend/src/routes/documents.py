@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, send_file, current_app
 from src.models import db, User, MemberStatus, MemberGraduation, MemberQualification, DocumentAttachment
 from src.utils import create_all_thumbnails, optimize_image, is_valid_image
 from src.routes.auth import login_required, get_current_user
+from src.utils.fields import requested_fields
 from werkzeug.utils import secure_filename
 import os
 import uuid
@@ -201,7 +202,7 @@ def get_document_metadata(document_id):
     if related_object and not check_access_permission(user, related_object):
         return jsonify({'error': 'Sem permissão para acessar este documento'}), 403
     
-    return jsonify(document.to_dict()), 200
+    return jsonify(document.to_dict(requested_fields())), 200
 
 @documents_bp.route('/documents/<int:document_id>/view', methods=['GET'])
 @login_required
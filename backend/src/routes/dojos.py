@@ -1,9 +1,23 @@
-from flask import Blueprint, request, jsonify
-from src.models import db, Dojo, User
+from flask import Blueprint, request, jsonify, current_app, url_for, Response, stream_with_context
+from itsdangerous import URLSafeSerializer, BadSignature
+from werkzeug.http import is_resource_modified
+from src.models import db, Dojo, User, Student, MemberStatus, Event, EventOccurrence
 from src.routes.auth import login_required, get_current_user, admin_required
+from src.utils.ics import calendar_header, calendar_footer, render_event
+from src.utils.materializer import plain_occurrence_filter
+from src.utils.cache import TTLCache, invalidate_on_commit
+import hashlib
 
 dojos_bp = Blueprint('dojos', __name__)
 
+# Contagens de membros de todos os dojos, limpas a cada commit em Student/MemberStatus
+member_counts_cache = TTLCache(ttl=300)
+invalidate_on_commit(member_counts_cache, Student, MemberStatus)
+
+def get_member_counts():
+    """Contagens de membros por dojo (uma consulta GROUP BY, em cache)"""
+    return member_counts_cache.get_or_set('all', Dojo.member_counts)
+
 @dojos_bp.route('/dojos', methods=['GET'])
 @login_required
 def get_dojos():
@@ -17,7 +31,7 @@ def get_dojos():
         dojos = Dojo.query.filter_by(is_active=True).order_by(Dojo.name.asc()).all()
         
         return jsonify({
-            'dojos': [dojo.to_dict() for dojo in dojos]
+            'dojos': [dojo.to_dict(counts=get_member_counts()) for dojo in dojos]
         }), 200
         
     except Exception as e:
@@ -40,7 +54,7 @@ def get_dojo(dojo_id):
         if not current_user.can_access_dojo(dojo_id):
             return jsonify({'error': 'Access denied'}), 403
         
-        return jsonify({'dojo': dojo.to_dict()}), 200
+        return jsonify({'dojo': dojo.to_dict(counts=get_member_counts())}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -163,6 +177,14 @@ def delete_dojo(dojo_id):
                 'error': f'Cannot delete dojo. There are {user_count} user(s) linked to this dojo. Please reassign or delete them first.'
             }), 400
         
+        # Verifica se há eventos do dojo (chave estrangeira aplicada com foreign_keys=ON)
+        event_count = Event.query.filter_by(dojo_id=dojo_id).count()
+        
+        if event_count > 0:
+            return jsonify({
+                'error': f'Cannot delete dojo. There are {event_count} event(s) linked to this dojo. Please delete them first.'
+            }), 400
+        
         # Se não há dependências, pode excluir
         db.session.delete(dojo)
         db.session.commit()
@@ -193,7 +215,7 @@ def get_dojo_stats(dojo_id):
         if not dojo:
             return jsonify({'error': 'Dojo not found'}), 404
         
-        stats = dojo.get_stats()
+        stats = dojo.get_stats(counts=get_member_counts())
         
         return jsonify({
             'dojo_id': dojo_id,
@@ -204,3 +226,96 @@ def get_dojo_stats(dojo_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+
+def calendar_feed_serializer():
+    """Assinatura das chaves dos feeds de calendário (não expiram, como as URLs de assinatura)"""
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='dojo-calendar-feed')
+
+def calendar_feed_filter(dojo_id):
+    """Eventos publicados no feed do dojo: os do próprio dojo e os administrativos"""
+    return db.or_(Event.dojo_id == dojo_id, Event.event_type == 'admin')
+
+@dojos_bp.route('/dojos/<int:dojo_id>/calendar-feed', methods=['GET'])
+@login_required
+def get_calendar_feed(dojo_id):
+    """Retorna a URL de assinatura (iCalendar) do calendário do dojo"""
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        if not current_user.can_access_dojo(dojo_id):
+            return jsonify({'error': 'Access denied'}), 403
+        
+        dojo = Dojo.query.get(dojo_id)
+        if not dojo:
+            return jsonify({'error': 'Dojo not found'}), 404
+        
+        key = calendar_feed_serializer().dumps(dojo_id)
+        
+        return jsonify({
+            'dojo_id': dojo_id,
+            'key': key,
+            'url': url_for('dojos.get_calendar_ics', dojo_id=dojo_id, key=key, _external=True)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@dojos_bp.route('/dojos/<int:dojo_id>/calendar.ics', methods=['GET'])
+def get_calendar_ics(dojo_id):
+    """Feed iCalendar do dojo (autenticado pela chave assinada em ?key=)"""
+    try:
+        try:
+            if calendar_feed_serializer().loads(request.args.get('key', '')) != dojo_id:
+                raise BadSignature('dojo mismatch')
+        except BadSignature:
+            return jsonify({'error': 'Invalid calendar key'}), 403
+        
+        dojo = Dojo.query.get(dojo_id)
+        if not dojo:
+            return jsonify({'error': 'Dojo not found'}), 404
+        
+        scope = calendar_feed_filter(dojo_id)
+        exception_filter = db.not_(plain_occurrence_filter())
+        
+        # Validador: quantidade e última alteração de eventos e exceções. Sem
+        # Last-Modified: a exclusão de um evento não avança o maior updated_at,
+        # só a contagem (que entra no ETag)
+        event_count, events_updated = db.session.query(
+            db.func.count(Event.id), db.func.max(Event.updated_at)
+        ).filter(scope).one()
+        exception_count, exceptions_updated = db.session.query(
+            db.func.count(EventOccurrence.id), db.func.max(EventOccurrence.updated_at)
+        ).join(Event, EventOccurrence.event_id == Event.id).filter(scope, exception_filter).one()
+        
+        etag = hashlib.md5(
+            f'{dojo_id}:{dojo.name}:{event_count}:{events_updated}:{exception_count}:{exceptions_updated}'.encode()
+        ).hexdigest()
+        
+        # Calendário sem alterações: 304 sem serializar nada
+        if not is_resource_modified(request.environ, etag=etag):
+            response = Response(status=304)
+        else:
+            exceptions = {}
+            for occurrence in EventOccurrence.query.join(Event, EventOccurrence.event_id == Event.id).filter(
+                scope, exception_filter
+            ).order_by(EventOccurrence.occurrence_date):
+                exceptions.setdefault(occurrence.event_id, []).append(occurrence)
+            
+            def generate():
+                yield calendar_header(dojo.name)
+                for event in Event.query.filter(scope).order_by(Event.id).yield_per(100):
+                    yield render_event(event, exceptions.get(event.id, ()))
+                yield calendar_footer()
+            
+            response = Response(stream_with_context(generate()), mimetype='text/calendar')
+            response.headers['Content-Disposition'] = f'inline; filename="dojo-{dojo_id}.ics"'
+        
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
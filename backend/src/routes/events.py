@@ -1,118 +1,194 @@
-from flask import Blueprint, request, jsonify
-from src.models import db, Event, EventReminder, EventOccurrence, User, Dojo
+from flask import Blueprint, request, jsonify, current_app, Response
+from src.models import db, Event, EventReminder, EventReminderFire, EventOccurrence, User, Dojo
 from src.routes.auth import login_required
-from datetime import datetime, timedelta
+from src.utils.recurrence import RecurrenceRule
+from src.utils.materializer import write_window_end, retention_cutoff, materialization_end
+from src.utils.reminders import refresh_reminder_fires
+from src.utils.cache import TTLCache, invalidate_on_commit
+from src.utils.event_bus import change_bus
+from src.utils.fields import requested_fields, related_options, wants
+from src.utils.serializers import EVENT_ROWS, row_serializers_enabled, json_response
+from src.utils.search import EVENT_SEARCH
+from src.utils.pagination import cursor_requested, keyset_page
+from sqlalchemy.orm import joinedload, aliased
+from datetime import datetime, timedelta, time
 import uuid
+import json
 
 events_bp = Blueprint('events', __name__)
 
+# Estatísticas por dojo_id (None = todos), limpas a cada commit que altera eventos
+statistics_cache = TTLCache(ttl=300)
+invalidate_on_commit(statistics_cache, Event)
+
+
+def occurrence_mode():
+    """Retorna o modo de ocorrências configurado ('materialized' ou 'virtual')"""
+    return current_app.config.get('EVENT_OCCURRENCE_MODE', 'materialized')
+
+
+def list_occurrences(event, stored, window_start, window_end, limit=None):
+    """
+    Retorna as ocorrências de um evento recorrente dentro de uma janela
+    
+    No modo 'materialized' as linhas de event_occurrences já são a lista
+    completa. No modo 'virtual' as datas são calculadas pela regra e as
+    linhas armazenadas (exceções) substituem as datas correspondentes.
+    `stored` deve conter as linhas do evento dentro da janela, ordenadas.
+    """
+    if occurrence_mode() != 'virtual':
+        return stored[:limit] if limit is not None else stored
+    
+    exceptions = {occ.occurrence_date: occ for occ in stored}
+    dates = RecurrenceRule.from_event(event).between(window_start, window_end, limit=limit)
+    return [exceptions.get(date) or EventOccurrence.virtual(event, date) for date in dates]
+
+
+def load_upcoming_occurrences(events, window_start, window_end, per_event=20):
+    """
+    Busca as primeiras ocorrências armazenadas de vários eventos em uma única consulta
+    
+    Usa ROW_NUMBER() OVER (PARTITION BY event_id ...) para limitar a
+    `per_event` ocorrências por evento dentro da janela.
+    
+    Returns:
+        Dicionário {event_id: [EventOccurrence, ...]} ordenado por data
+    """
+    grouped = {event.id: [] for event in events}
+    if not grouped:
+        return grouped
+    
+    row_number = db.func.row_number().over(
+        partition_by=EventOccurrence.event_id,
+        order_by=EventOccurrence.occurrence_date.asc()
+    ).label('row_number')
+    
+    ranked = db.session.query(EventOccurrence, row_number).filter(
+        EventOccurrence.event_id.in_(list(grouped)),
+        EventOccurrence.occurrence_date >= window_start,
+        EventOccurrence.occurrence_date <= window_end
+    ).subquery()
+    
+    occurrence_alias = aliased(EventOccurrence, ranked)
+    occurrences = db.session.query(occurrence_alias).filter(
+        ranked.c.row_number <= per_event
+    ).order_by(ranked.c.event_id, ranked.c.occurrence_date).all()
+    
+    for occurrence in occurrences:
+        grouped[occurrence.event_id].append(occurrence)
+    
+    return grouped
+
+
+def recurrence_signature(event):
+    """Campos que determinam as datas das ocorrências de um evento"""
+    return (
+        event.start_datetime, event.end_datetime, event.recurrence_pattern,
+        event.recurrence_interval, event.recurrence_days,
+        event.recurrence_end_date, event.recurrence_count
+    )
+
 
 def generate_recurring_occurrences(event):
-    """Gera as ocorrências de um evento recorrente"""
+    """
+    Sincroniza as ocorrências armazenadas com a regra de recorrência do evento
+    
+    Calcula o novo conjunto de datas, compara com as linhas existentes e
+    aplica apenas a diferença em lote. Ocorrências cujo dia continua na
+    série mantêm suspensões e overrides (apenas o horário é ajustado).
+    
+    No modo materializado a sincronização cobre só a janela gravada, do dia
+    da retenção (ou do início da série) até o fim da janela de escrita: o
+    custo não cresce com a idade da série e as linhas mais antigas que a
+    retenção não são tocadas.
+    
+    Returns:
+        Número de ocorrências da série na janela após a sincronização
+    """
     if not event.is_recurring:
         return
     
-    # Limpar ocorrências existentes
-    EventOccurrence.query.filter_by(event_id=event.id).delete()
-    
-    occurrences = []
-    current_date = event.start_datetime
+    rule = RecurrenceRule.from_event(event)
     duration = event.end_datetime - event.start_datetime
+    virtual = occurrence_mode() == 'virtual'
+    cutoff = retention_cutoff()
     
-    # Definir limite máximo de ocorrências se não houver recurrence_count
-    max_occurrences = event.recurrence_count if event.recurrence_count else 100
-    occurrence_counter = 0
+    existing_query = db.session.query(
+        EventOccurrence.id, EventOccurrence.occurrence_date, EventOccurrence.end_datetime,
+        EventOccurrence.status, EventOccurrence.suspension_reason, EventOccurrence.override_title,
+        EventOccurrence.override_description, EventOccurrence.override_location
+    ).filter(EventOccurrence.event_id == event.id)
     
-    # Data limite
-    end_limit = event.recurrence_end_date if event.recurrence_end_date else (current_date + timedelta(days=365))
+    if not virtual:
+        # Início da janela no começo do dia, já que a comparação é por dia
+        window_start = datetime.combine(max(event.start_datetime, cutoff).date(), time.min)
+        existing_query = existing_query.filter(EventOccurrence.occurrence_date >= window_start)
+    existing = existing_query.all()
     
-    # Para recorrência semanal com dias específicos, precisamos de lógica especial
-    if event.recurrence_pattern == 'weekly' and event.recurrence_days:
-        allowed_days = [int(d) for d in event.recurrence_days.split(',')]
-        
-        # Começar da data inicial e iterar dia por dia
-        current_date = event.start_datetime.replace(hour=event.start_datetime.hour, minute=event.start_datetime.minute)
-        
-        while occurrence_counter < max_occurrences and current_date <= end_limit:
-            if current_date.weekday() in allowed_days:
-                occurrence = EventOccurrence(
-                    event_id=event.id,
-                    series_id=event.series_id,
-                    occurrence_date=current_date,
-                    end_datetime=current_date + duration,
-                    status='active'
-                )
-                occurrences.append(occurrence)
-                occurrence_counter += 1
-            
-            # Avançar 1 dia
-            current_date += timedelta(days=1)
-            
-            # Se já temos ocorrências suficientes ou passamos da data limite, parar
-            if occurrence_counter >= max_occurrences or current_date > end_limit:
-                break
+    if virtual:
+        # Apenas exceções ficam armazenadas: o alvo são os dias das exceções que continuam na série
+        target = {}
+        for row in existing:
+            if EventOccurrence.is_exception.fget(row):
+                day_start = datetime.combine(row.occurrence_date.date(), datetime.min.time())
+                dates = rule.between(day_start, day_start + timedelta(days=1) - timedelta(microseconds=1), limit=1)
+                if dates:
+                    target[dates[0].date()] = dates[0]
     else:
-        # Lógica para outros padrões de recorrência
-        while occurrence_counter < max_occurrences and current_date <= end_limit:
-            # Verificar se esta data deve ser incluída baseado no padrão
-            should_include = False
-            
-            if event.recurrence_pattern == 'daily':
-                should_include = True
-            
-            elif event.recurrence_pattern == 'weekly':
-                # Sem dias específicos, usar o dia da semana do evento original
-                if current_date.weekday() == event.start_datetime.weekday():
-                    should_include = True
-            
-            elif event.recurrence_pattern == 'monthly':
-                # Mesmo dia do mês
-                if current_date.day == event.start_datetime.day:
-                    should_include = True
-            
-            elif event.recurrence_pattern == 'yearly':
-                # Mesmo dia e mês
-                if current_date.month == event.start_datetime.month and current_date.day == event.start_datetime.day:
-                    should_include = True
-            
-            if should_include:
-                occurrence = EventOccurrence(
-                    event_id=event.id,
-                    series_id=event.series_id,
-                    occurrence_date=current_date,
-                    end_datetime=current_date + duration,
-                    status='active'
-                )
-                occurrences.append(occurrence)
-                occurrence_counter += 1
-            
-            # Avançar para próxima data baseado no intervalo e padrão
-            if event.recurrence_pattern == 'daily':
-                current_date += timedelta(days=event.recurrence_interval)
-            elif event.recurrence_pattern == 'weekly':
-                current_date += timedelta(weeks=event.recurrence_interval)
-            elif event.recurrence_pattern == 'monthly':
-                # Adicionar meses (aproximado)
-                month = current_date.month + event.recurrence_interval
-                year = current_date.year
-                while month > 12:
-                    month -= 12
-                    year += 1
-                try:
-                    current_date = current_date.replace(year=year, month=month)
-                except ValueError:
-                    # Se o dia não existe no mês (ex: 31 de fevereiro), usar último dia do mês
-                    import calendar
-                    last_day = calendar.monthrange(year, month)[1]
-                    current_date = current_date.replace(year=year, month=month, day=last_day)
-            elif event.recurrence_pattern == 'yearly':
-                current_date = current_date.replace(year=current_date.year + event.recurrence_interval)
-    
-    # Adicionar todas as ocorrências ao banco
-    for occurrence in occurrences:
-        db.session.add(occurrence)
+        # Séries abertas: gravar apenas a janela curta à frente; o job de
+        # materialização estende até o horizonte (séries com data final vão
+        # até o fim). Linhas já gravadas além da janela continuam na série.
+        end_limit = write_window_end(event)
+        if existing:
+            last_day = max(row.occurrence_date for row in existing).date()
+            end_limit = max(end_limit, datetime.combine(last_day, time.max))
+        
+        # Datas calculadas diretamente pela regra, sem percorrer o calendário
+        dates = rule.between(window_start, end_limit)
+        target = {date.date(): date for date in dates}
+    
+    # Comparar por dia: mantém a linha (e seus overrides) se o dia continua na série
+    to_delete = []
+    to_update = []
+    for row in existing:
+        new_date = target.pop(row.occurrence_date.date(), None)
+        if new_date is None:
+            to_delete.append(row.id)
+        elif row.occurrence_date != new_date or row.end_datetime != new_date + duration:
+            to_update.append({
+                'id': row.id,
+                'occurrence_date': new_date,
+                'end_datetime': new_date + duration,
+                'updated_at': datetime.utcnow()
+            })
     
-    return len(occurrences)
+    if to_delete:
+        db.session.execute(db.delete(EventOccurrence).where(EventOccurrence.id.in_(to_delete)))
+    
+    if to_update:
+        db.session.execute(db.update(EventOccurrence), to_update)
+    
+    # Restam em target apenas os dias sem linha (no modo virtual, sempre vazio);
+    # dias anteriores à janela de retenção não são recriados
+    missing = sorted(date for date in target.values() if date >= cutoff)
+    if missing and not virtual:
+        db.session.execute(db.insert(EventOccurrence), [
+            {
+                'event_id': event.id,
+                'series_id': event.series_id,
+                'occurrence_date': occurrence_date,
+                'end_datetime': occurrence_date + duration,
+                'status': 'active'
+            }
+            for occurrence_date in missing
+        ])
+    
+    return 0 if virtual else len(existing) - len(to_delete) + len(missing)
+
+
+def publish_calendar_change(action, event_data, **extra):
+    """Notifica os clientes do stream sobre uma alteração já gravada (chamar após o commit)"""
+    change_bus.publish('calendar', {'action': action, 'event': event_data, **extra}, dojo_id=event_data['dojo_id'])
 
 
 def can_edit_event(user, event):
@@ -143,6 +219,8 @@ def get_events():
         if not user:
             return jsonify({'error': 'Usuário não encontrado'}), 404
         
+        fields = requested_fields()
+        
         # Construir query base
         query = Event.query
         
@@ -181,7 +259,12 @@ def get_events():
             is_rec = is_recurring.lower() == 'true'
             query = query.filter(Event.is_recurring == is_rec)
         
-        if search:
+        # Busca (título, descrição, local) pelo índice FTS5: só as linhas que
+        # contêm os termos são lidas de events e então filtradas por data/dojo
+        match = EVENT_SEARCH.match(search) if search and EVENT_SEARCH.available() else None
+        if match is not None:
+            query = query.join(match, match.c.rowid == Event.id)
+        elif search:
             search_pattern = f'%{search}%'
             query = query.filter(
                 db.or_(
@@ -190,52 +273,225 @@ def get_events():
                 )
             )
         
-        # Ordenação
+        # Ordenação (com busca e sem sort_by, por relevância)
         sort_by = request.args.get('sort_by', 'start_datetime')
         sort_order = request.args.get('sort_order', 'asc')
         
-        if sort_by == 'start_datetime':
+        if match is not None and 'sort_by' not in request.args:
+            query = query.order_by(match.c.rank, Event.start_datetime.asc())
+        elif sort_by == 'start_datetime':
             query = query.order_by(Event.start_datetime.asc() if sort_order == 'asc' else Event.start_datetime.desc())
         elif sort_by == 'title':
             query = query.order_by(Event.title.asc() if sort_order == 'asc' else Event.title.desc())
         elif sort_by == 'event_type':
             query = query.order_by(Event.event_type.asc() if sort_order == 'asc' else Event.event_type.desc())
         
+        # Se solicitado, expandir eventos recorrentes com suas ocorrências
+        expand_occurrences = request.args.get('expand_occurrences', 'false').lower() == 'true'
+        
+        # Caminho rápido (sem expansão, que precisa dos objetos): tuplas de colunas
+        fast = row_serializers_enabled() and not expand_occurrences
+        if fast:
+            query = EVENT_ROWS.select(query, fields)
+        else:
+            query = query.options(*related_options(Event, fields, joinedload))
+        
         # Paginação
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 50, type=int)
         
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        events = pagination.items
+        # Por cursor (?cursor=): início e id depois da última linha, sem OFFSET
+        if cursor_requested():
+            # Sem sort_by, a busca ordena por relevância, que o cursor não percorre
+            if sort_by != 'start_datetime' or (match is not None and 'sort_by' not in request.args):
+                return jsonify({'error': 'Paginação por cursor disponível apenas com sort_by=start_datetime'}), 400
+            try:
+                events, page_info = keyset_page(
+                    query, [Event.start_datetime, Event.id], per_page,
+                    descending=sort_order == 'desc', entity=not fast
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        else:
+            pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+            events = pagination.items
+            page_info = {
+                'total': pagination.total,
+                'pages': pagination.pages,
+                'current_page': page,
+                'per_page': per_page
+            }
+        
+        # Buscar ocorrências futuras (próximos 90 dias) de todos os eventos da página de uma vez
+        upcoming = {}
+        if expand_occurrences:
+            today = datetime.utcnow()
+            future_limit = today + timedelta(days=90)
+            recurring_events = [event for event in events if event.is_recurring]
+            upcoming = load_upcoming_occurrences(recurring_events, today, future_limit, per_event=20)
+        
+        if fast:
+            events_data = EVENT_ROWS.serialize(events, fields)
+        else:
+            events_data = []
+            for event in events:
+                event_dict = event.to_dict(fields)
+                
+                if expand_occurrences and event.is_recurring:
+                    occurrences = list_occurrences(event, upcoming[event.id], today, future_limit, limit=20)
+                    event_dict['upcoming_occurrences'] = [occ.to_dict() for occ in occurrences]
+                
+                events_data.append(event_dict)
+        
+        return json_response({'events': events_data, **page_info}), 200
         
-        # Se solicitado, expandir eventos recorrentes com suas ocorrências
-        expand_occurrences = request.args.get('expand_occurrences', 'false').lower() == 'true'
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def flatten_occurrence(event_dict, event, occurrence):
+    """Combina os dados do evento pai com uma ocorrência específica"""
+    item = dict(event_dict)
+    item.update({
+        'start_datetime': occurrence.occurrence_date.isoformat(),
+        'end_datetime': occurrence.end_datetime.isoformat(),
+        'occurrence_id': occurrence.id,
+        'occurrence_date': occurrence.occurrence_date.isoformat(),
+        'is_occurrence': True
+    })
+    
+    # Suspensão/cancelamento do evento pai vale para toda a série
+    if event.status == 'active':
+        item['status'] = occurrence.status
+        item['suspension_reason'] = occurrence.suspension_reason
+    
+    if occurrence.override_title:
+        item['title'] = occurrence.override_title
+    if occurrence.override_description:
+        item['description'] = occurrence.override_description
+    if occurrence.override_location:
+        item['location'] = occurrence.override_location
+    
+    return item
+
+
+@events_bp.route('/events/calendar', methods=['GET'])
+@login_required
+def get_calendar():
+    """Lista eventos e ocorrências que intersectam uma janela, já expandidos e ordenados"""
+    try:
+        user_id = request.current_user_id
+        user = User.query.get(user_id)
+        
+        if not user:
+            return jsonify({'error': 'Usuário não encontrado'}), 404
         
-        events_data = []
-        for event in events:
-            event_dict = event.to_dict()
+        start = request.args.get('start')
+        end = request.args.get('end')
+        
+        if not start or not end:
+            return jsonify({'error': 'Parâmetros start e end são obrigatórios'}), 400
+        
+        window_start = datetime.fromisoformat(start)
+        window_end = datetime.fromisoformat(end)
+        
+        if window_end < window_start:
+            return jsonify({'error': 'end deve ser posterior a start'}), 400
+        
+        # Filtros
+        event_type = request.args.get('event_type')
+        dojo_id = request.args.get('dojo_id')
+        category = request.args.get('category')
+        status = request.args.get('status')
+        is_recurring = request.args.get('is_recurring')
+        search = request.args.get('search')
+        
+        filters = []
+        if event_type:
+            filters.append(Event.event_type == event_type)
+        if dojo_id:
+            filters.append(Event.dojo_id == dojo_id)
+        if category:
+            filters.append(Event.category == category)
+        matching_ids = EVENT_SEARCH.matching_ids(search) if search and EVENT_SEARCH.available() else None
+        if matching_ids is not None:
+            filters.append(Event.id.in_(matching_ids))
+        elif search:
+            search_pattern = f'%{search}%'
+            filters.append(db.or_(
+                Event.title.ilike(search_pattern),
+                Event.description.ilike(search_pattern)
+            ))
+        
+        include_single = is_recurring is None or is_recurring.lower() != 'true'
+        include_series = is_recurring is None or is_recurring.lower() == 'true'
+        
+        items = []
+        
+        # Eventos únicos que intersectam a janela (1 query)
+        if include_single:
+            single_query = Event.query.filter(
+                *filters,
+                db.or_(Event.is_recurring == False, Event.is_recurring == None),
+                Event.start_datetime <= window_end,
+                Event.end_datetime >= window_start
+            )
             
-            if expand_occurrences and event.is_recurring:
-                # Buscar ocorrências futuras (próximos 90 dias)
-                today = datetime.utcnow()
-                future_limit = today + timedelta(days=90)
-                
-                occurrences = EventOccurrence.query.filter(
-                    EventOccurrence.event_id == event.id,
-                    EventOccurrence.occurrence_date >= today,
-                    EventOccurrence.occurrence_date <= future_limit
-                ).order_by(EventOccurrence.occurrence_date.asc()).limit(20).all()
+            if row_serializers_enabled():
+                single_items = [
+                    (item['start_datetime'], item)
+                    for item in EVENT_ROWS.serialize(EVENT_ROWS.select(single_query).all())
+                ]
+            else:
+                single_items = [
+                    (event.start_datetime, event.to_dict())
+                    for event in single_query.options(joinedload(Event.dojo))
+                ]
+            
+            for start_datetime, item in single_items:
+                item.update({'occurrence_id': None, 'occurrence_date': None, 'is_occurrence': False})
+                items.append((start_datetime, item['id'], item))
+        
+        # Séries recorrentes iniciadas até o fim da janela (1 query) e suas ocorrências (1 query)
+        if include_series:
+            series = Event.query.options(joinedload(Event.dojo)).filter(
+                *filters,
+                Event.is_recurring == True,
+                Event.start_datetime <= window_end
+            ).all()
+            
+            stored_by_event = {event.id: [] for event in series}
+            if series:
+                stored = EventOccurrence.query.filter(
+                    EventOccurrence.event_id.in_(list(stored_by_event)),
+                    EventOccurrence.occurrence_date <= window_end,
+                    EventOccurrence.end_datetime >= window_start
+                ).order_by(EventOccurrence.occurrence_date.asc()).all()
                 
-                event_dict['upcoming_occurrences'] = [occ.to_dict() for occ in occurrences]
+                for occurrence in stored:
+                    stored_by_event[occurrence.event_id].append(occurrence)
             
-            events_data.append(event_dict)
+            for event in series:
+                event_dict = event.to_dict()
+                # Incluir ocorrências iniciadas antes da janela que ainda estão em andamento
+                duration = event.end_datetime - event.start_datetime
+                occurrences = list_occurrences(event, stored_by_event[event.id], window_start - duration, window_end)
+                
+                for occurrence in occurrences:
+                    if occurrence.end_datetime < window_start:
+                        continue
+                    items.append((occurrence.occurrence_date, event.id, flatten_occurrence(event_dict, event, occurrence)))
         
-        return jsonify({
-            'events': events_data,
-            'total': pagination.total,
-            'pages': pagination.pages,
-            'current_page': page,
-            'per_page': per_page
+        if status:
+            items = [entry for entry in items if entry[2]['status'] == status]
+        
+        items.sort(key=lambda entry: (entry[0], entry[1]))
+        
+        return json_response({
+            'start': window_start.isoformat(),
+            'end': window_end.isoformat(),
+            'events': [entry[2] for entry in items],
+            'total': len(items)
         }), 200
         
     except Exception as e:
@@ -252,10 +508,12 @@ def get_event(event_id):
         if not event:
             return jsonify({'error': 'Evento não encontrado'}), 404
         
-        event_dict = event.to_dict()
+        fields = requested_fields()
+        event_dict = event.to_dict(fields)
         
         # Incluir avisos
-        event_dict['reminders'] = [reminder.to_dict() for reminder in event.reminders]
+        if wants(fields, 'reminders'):
+            event_dict['reminders'] = [reminder.to_dict() for reminder in event.reminders]
         
         return jsonify(event_dict), 200
         
@@ -352,7 +610,9 @@ def create_event():
         if event.is_recurring:
             occurrences_count = generate_recurring_occurrences(event)
         
+        refresh_reminder_fires([event])
         db.session.commit()
+        publish_calendar_change('created', event.to_dict())
         
         response_data = {
             'message': 'Evento criado com sucesso',
@@ -391,6 +651,7 @@ def update_event(event_id):
             return jsonify({'error': 'Você não tem permissão para editar este evento'}), 403
         
         data = request.get_json()
+        previous_signature = recurrence_signature(event)
         
         # Atualizar campos
         if 'title' in data:
@@ -415,31 +676,28 @@ def update_event(event_id):
             event.suspension_reason = data['suspension_reason']
         
         # Atualizar recorrência se necessário
-        recurrence_changed = False
         if 'recurrence_pattern' in data:
             event.recurrence_pattern = data['recurrence_pattern']
-            recurrence_changed = True
         if 'recurrence_interval' in data:
             event.recurrence_interval = data['recurrence_interval']
-            recurrence_changed = True
         if 'recurrence_days' in data:
             event.recurrence_days = data['recurrence_days']
-            recurrence_changed = True
         if 'recurrence_end_date' in data:
             event.recurrence_end_date = datetime.fromisoformat(data['recurrence_end_date']) if data['recurrence_end_date'] else None
-            recurrence_changed = True
         if 'recurrence_count' in data:
             event.recurrence_count = data['recurrence_count']
-            recurrence_changed = True
         
         event.updated_at = datetime.utcnow()
         
-        # Regenerar ocorrências se evento recorrente foi modificado
+        # Sincronizar ocorrências apenas se as datas da série mudaram
+        # (título, local etc. ficam no evento pai e não tocam nas ocorrências)
         occurrences_count = 0
-        if event.is_recurring and (recurrence_changed or 'start_datetime' in data or 'end_datetime' in data):
+        if event.is_recurring and recurrence_signature(event) != previous_signature:
             occurrences_count = generate_recurring_occurrences(event)
         
+        refresh_reminder_fires([event])
         db.session.commit()
+        publish_calendar_change('updated', event.to_dict())
         
         response_data = {
             'message': 'Evento atualizado com sucesso',
@@ -477,8 +735,10 @@ def delete_event(event_id):
         if not can_edit_event(user, event):
             return jsonify({'error': 'Você não tem permissão para deletar este evento'}), 403
         
+        event_data = event.to_dict()
         db.session.delete(event)
         db.session.commit()
+        publish_calendar_change('deleted', event_data)
         
         return jsonify({'message': 'Evento deletado com sucesso'}), 200
         
@@ -513,7 +773,9 @@ def suspend_event(event_id):
         event.suspension_reason = data.get('reason', '')
         event.updated_at = datetime.utcnow()
         
+        refresh_reminder_fires([event])
         db.session.commit()
+        publish_calendar_change('suspended', event.to_dict())
         
         return jsonify({
             'message': 'Evento suspenso com sucesso',
@@ -549,7 +811,9 @@ def reactivate_event(event_id):
         event.suspension_reason = None
         event.updated_at = datetime.utcnow()
         
+        refresh_reminder_fires([event])
         db.session.commit()
+        publish_calendar_change('reactivated', event.to_dict())
         
         return jsonify({
             'message': 'Evento reativado com sucesso',
@@ -598,7 +862,11 @@ def create_reminder(event_id):
         )
         
         db.session.add(reminder)
+        db.session.flush()
+        
+        refresh_reminder_fires([event])
         db.session.commit()
+        publish_calendar_change('reminder_created', event.to_dict())
         
         return jsonify({
             'message': 'Aviso criado com sucesso',
@@ -628,23 +896,33 @@ def get_event_occurrences(event_id):
         end_date = request.args.get('end_date')
         status = request.args.get('status')
         
+        virtual = occurrence_mode() == 'virtual'
         query = EventOccurrence.query.filter_by(event_id=event_id)
         
-        if start_date:
-            start_dt = datetime.fromisoformat(start_date)
+        start_dt = datetime.fromisoformat(start_date) if start_date else None
+        end_dt = datetime.fromisoformat(end_date) if end_date else None
+        
+        if start_dt:
             query = query.filter(EventOccurrence.occurrence_date >= start_dt)
         
-        if end_date:
-            end_dt = datetime.fromisoformat(end_date)
+        if end_dt:
             query = query.filter(EventOccurrence.occurrence_date <= end_dt)
         
-        if status:
+        if status and not virtual:
             query = query.filter(EventOccurrence.status == status)
         
         query = query.order_by(EventOccurrence.occurrence_date.asc())
         
         occurrences = query.all()
         
+        if virtual:
+            # Sem janela explícita, usar o mesmo horizonte da materialização
+            window_start = start_dt or event.start_datetime
+            window_end = end_dt or materialization_end(event, timedelta(days=current_app.config['EVENT_MATERIALIZE_HORIZON_DAYS']))
+            occurrences = list_occurrences(event, occurrences, window_start, window_end)
+            if status:
+                occurrences = [occ for occ in occurrences if occ.status == status]
+        
         # Combinar dados do evento pai com cada ocorrência
         occurrences_data = []
         for occ in occurrences:
@@ -663,36 +941,186 @@ def get_event_occurrences(event_id):
         return jsonify({'error': str(e)}), 500
 
 
+@events_bp.route('/events/<int:event_id>/occurrences/<occurrence_date>', methods=['PUT'])
+@login_required
+def update_occurrence(event_id, occurrence_date):
+    """Suspende, cancela ou sobrescreve os dados de uma ocorrência específica"""
+    try:
+        user_id = request.current_user_id
+        user = User.query.get(user_id)
+        
+        if not user:
+            return jsonify({'error': 'Usuário não encontrado'}), 404
+        
+        event = Event.query.get(event_id)
+        
+        if not event:
+            return jsonify({'error': 'Evento não encontrado'}), 404
+        
+        if not event.is_recurring:
+            return jsonify({'error': 'Este evento não é recorrente'}), 400
+        
+        # Verificar permissões
+        if not can_edit_event(user, event):
+            return jsonify({'error': 'Você não tem permissão para editar este evento'}), 403
+        
+        occurrence_dt = datetime.fromisoformat(occurrence_date)
+        occurrence = EventOccurrence.query.filter_by(event_id=event_id, occurrence_date=occurrence_dt).first()
+        
+        if not occurrence:
+            if not RecurrenceRule.from_event(event).between(occurrence_dt, occurrence_dt, limit=1):
+                return jsonify({'error': 'Ocorrência não encontrada nesta série'}), 404
+            occurrence = EventOccurrence.virtual(event, occurrence_dt)
+        
+        data = request.get_json() or {}
+        
+        for field in ('status', 'suspension_reason', 'override_title', 'override_description', 'override_location'):
+            if field in data:
+                setattr(occurrence, field, data[field])
+        
+        # No modo virtual, ocorrências iguais ao evento pai não são armazenadas
+        if occurrence_mode() == 'virtual' and not occurrence.is_exception:
+            if occurrence.id:
+                db.session.delete(occurrence)
+        else:
+            db.session.add(occurrence)
+        
+        refresh_reminder_fires([event])
+        db.session.commit()
+        publish_calendar_change('occurrence_updated', event.to_dict(), occurrence_date=occurrence_dt.isoformat())
+        
+        return jsonify({
+            'message': 'Ocorrência atualizada com sucesso',
+            'occurrence': occurrence.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@events_bp.route('/events/<int:event_id>/occurrences/<occurrence_date>', methods=['DELETE'])
+@login_required
+def reset_occurrence(event_id, occurrence_date):
+    """Remove as alterações de uma ocorrência, voltando aos dados do evento pai"""
+    try:
+        user_id = request.current_user_id
+        user = User.query.get(user_id)
+        
+        if not user:
+            return jsonify({'error': 'Usuário não encontrado'}), 404
+        
+        event = Event.query.get(event_id)
+        
+        if not event:
+            return jsonify({'error': 'Evento não encontrado'}), 404
+        
+        # Verificar permissões
+        if not can_edit_event(user, event):
+            return jsonify({'error': 'Você não tem permissão para editar este evento'}), 403
+        
+        occurrence_dt = datetime.fromisoformat(occurrence_date)
+        occurrence = EventOccurrence.query.filter_by(event_id=event_id, occurrence_date=occurrence_dt).first()
+        
+        if not occurrence:
+            return jsonify({'error': 'Ocorrência não possui alterações'}), 404
+        
+        if occurrence_mode() == 'virtual':
+            db.session.delete(occurrence)
+        else:
+            occurrence.status = 'active'
+            occurrence.suspension_reason = None
+            occurrence.override_title = None
+            occurrence.override_description = None
+            occurrence.override_location = None
+        
+        refresh_reminder_fires([event])
+        db.session.commit()
+        publish_calendar_change('occurrence_reset', event.to_dict(), occurrence_date=occurrence_dt.isoformat())
+        
+        return jsonify({'message': 'Ocorrência restaurada com sucesso'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@events_bp.route('/events/stream', methods=['GET'])
+@login_required
+def stream_events():
+    """
+    Stream SSE de alterações do calendário e de avisos ativados
+    
+    O EventSource do navegador não envia cabeçalhos: use ?token=<jwt>.
+    """
+    try:
+        user_id = request.current_user_id
+        user = User.query.get(user_id)
+        
+        if not user:
+            return jsonify({'error': 'Usuário não encontrado'}), 404
+        
+        # Admin recebe tudo; usuários de dojo, mensagens gerais e do próprio dojo
+        subscription = change_bus.subscribe(dojo_id=None if user.role == 'admin' else user.dojo_id)
+        keepalive = current_app.config['EVENT_STREAM_KEEPALIVE']
+        
+        def generate():
+            try:
+                yield 'retry: 5000\n\n'
+                while True:
+                    message = subscription.get(timeout=keepalive)
+                    if message is None:
+                        yield ': keepalive\n\n'
+                    else:
+                        yield f"event: {message['kind']}\ndata: {json.dumps(message['data'])}\n\n"
+            finally:
+                change_bus.unsubscribe(subscription)
+        
+        return Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @events_bp.route('/events/reminders/active', methods=['GET'])
 @login_required
 def get_active_reminders():
     """Obtém avisos ativos para os próximos dias"""
     try:
-        # Buscar eventos com avisos ativos nos próximos 7 dias
-        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        user_id = request.current_user_id
+        user = User.query.get(user_id)
+        
+        if not user:
+            return jsonify({'error': 'Usuário não encontrado'}), 404
+        
+        # Avisos já disparados de eventos (ou ocorrências) nos próximos 7 dias
+        now = datetime.utcnow()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
         week_later = today + timedelta(days=7)
         
-        events = Event.query.filter(
-            Event.start_datetime >= today,
-            Event.start_datetime <= week_later,
-            Event.status == 'active'
-        ).all()
+        query = EventReminderFire.query.options(
+            joinedload(EventReminderFire.reminder),
+            joinedload(EventReminderFire.event).joinedload(Event.dojo)
+        ).filter(
+            EventReminderFire.event_start >= today,
+            EventReminderFire.event_start <= week_later,
+            EventReminderFire.fire_at <= now
+        )
+        
+        # Usuários de dojo veem avisos gerais e os do próprio dojo
+        if user.role != 'admin':
+            query = query.filter(db.or_(EventReminderFire.dojo_id.is_(None), EventReminderFire.dojo_id == user.dojo_id))
         
         active_reminders = []
         
-        for event in events:
-            for reminder in event.reminders:
-                if not reminder.is_active:
-                    continue
-                
-                # Calcular quando o aviso deve ser mostrado
-                reminder_date = event.start_datetime - timedelta(days=reminder.days_before)
-                
-                # Se a data do aviso é hoje ou passou, incluir
-                if reminder_date <= datetime.utcnow():
-                    reminder_dict = reminder.to_dict()
-                    reminder_dict['event'] = event.to_dict()
-                    active_reminders.append(reminder_dict)
+        for fire in query.order_by(EventReminderFire.event_start.asc()).all():
+            reminder_dict = fire.reminder.to_dict()
+            reminder_dict['event'] = fire.event.to_dict()
+            reminder_dict['occurrence_date'] = fire.event_start.isoformat()
+            active_reminders.append(reminder_dict)
         
         return jsonify({
             'reminders': active_reminders,
@@ -714,39 +1142,52 @@ def get_statistics():
         if not user:
             return jsonify({'error': 'Usuário não encontrado'}), 404
         
-        # Contar eventos por status
-        total_events = Event.query.count()
-        active_events = Event.query.filter_by(status='active').count()
-        suspended_events = Event.query.filter_by(status='suspended').count()
-        cancelled_events = Event.query.filter_by(status='cancelled').count()
+        dojo_id = request.args.get('dojo_id', type=int)
         
-        # Eventos por tipo
-        admin_events = Event.query.filter_by(event_type='admin').count()
-        dojo_events = Event.query.filter_by(event_type='dojo').count()
-        
-        # Eventos recorrentes
-        recurring_events = Event.query.filter_by(is_recurring=True).count()
-        
-        # Eventos por categoria
-        categories = db.session.query(
-            Event.category,
-            db.func.count(Event.id)
-        ).group_by(Event.category).all()
-        
-        return jsonify({
-            'total_events': total_events,
-            'by_status': {
-                'active': active_events,
-                'suspended': suspended_events,
-                'cancelled': cancelled_events
-            },
-            'by_type': {
-                'admin': admin_events,
-                'dojo': dojo_events
-            },
-            'recurring_events': recurring_events,
-            'by_category': {cat: count for cat, count in categories}
-        }), 200
+        return jsonify(statistics_cache.get_or_set(dojo_id, lambda: compute_statistics(dojo_id))), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+
+def compute_statistics(dojo_id=None):
+    """Calcula todos os contadores em uma única consulta agregada (uma linha por categoria)"""
+    def count_if(condition):
+        return db.func.sum(db.case((condition, 1), else_=0))
+    
+    query = db.session.query(
+        Event.category,
+        db.func.count(Event.id),
+        count_if(Event.status == 'active'),
+        count_if(Event.status == 'suspended'),
+        count_if(Event.status == 'cancelled'),
+        count_if(Event.event_type == 'admin'),
+        count_if(Event.event_type == 'dojo'),
+        count_if(Event.is_recurring == True)
+    )
+    
+    if dojo_id:
+        query = query.filter(Event.dojo_id == dojo_id)
+    
+    totals = [0] * 7
+    by_category = {}
+    for category, *counts in query.group_by(Event.category).all():
+        by_category[category] = counts[0]
+        totals = [total + (count or 0) for total, count in zip(totals, counts)]
+    
+    total_events, active_events, suspended_events, cancelled_events, admin_events, dojo_events, recurring_events = totals
+    
+    return {
+        'total_events': total_events,
+        'by_status': {
+            'active': active_events,
+            'suspended': suspended_events,
+            'cancelled': cancelled_events
+        },
+        'by_type': {
+            'admin': admin_events,
+            'dojo': dojo_events
+        },
+        'recurring_events': recurring_events,
+        'by_category': by_category
+    }
@@ -108,7 +108,12 @@ def create_graduation_by_student():
         return jsonify({'error': f'Erro ao criar graduação: {str(e)}'}), 500
 
 def update_current_graduation(member_status_id, discipline):
-    """Atualiza a graduação atual para uma disciplina, marcando a de maior nível"""
+    """
+    Atualiza a graduação atual para uma disciplina, marcando a de maior nível
+    
+    Também copia a graduação atual para as colunas de member_status, na
+    mesma transação da alteração da graduação.
+    """
     # Buscar todas as graduações da disciplina
     graduations = MemberGraduation.query.filter_by(
         member_status_id=member_status_id,
@@ -122,6 +127,10 @@ def update_current_graduation(member_status_id, discipline):
     # Marcar a de maior nível como atual
     if graduations:
         graduations[0].is_current = True
+    
+    member_status = MemberStatus.query.get(member_status_id)
+    if member_status:
+        member_status.set_current_rank(discipline, graduations[0] if graduations else None)
 
 @member_graduations_bp.route('/member-status/<int:member_status_id>/graduations', methods=['POST'])
 @login_required
@@ -1,6 +1,13 @@
 from flask import Blueprint, request, jsonify
-from src.models import db, Student, MemberStatus, MemberGraduation, MemberQualification, User
+from src.models import db, Student, MemberStatus, MemberGraduation, MemberQualification, DocumentAttachment, User
 from src.routes.auth import login_required, get_current_user
+from src.utils.fields import requested_fields, related_options, pick
+from src.utils.serializers import MEMBER_STATUS_ROWS, DOCUMENT_ROWS, row_serializers_enabled, json_response
+from src.utils.multiget import requested_ids, in_request_order
+from src.utils.search import STUDENT_SEARCH
+from src.utils.pagination import cursor_requested, keyset_page
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
 
 member_status_bp = Blueprint('member_status', __name__)
@@ -29,8 +36,21 @@ def list_member_status():
     current_status = request.args.get('current_status', '').strip()
     dojo_id = request.args.get('dojo_id', type=int)
     student_id = request.args.get('student_id', type=int)
+    aikido_rank = request.args.get('aikido_rank', '').strip()
+    toitsudo_rank = request.args.get('toitsudo_rank', '').strip()
+    sort_by = request.args.get('sort_by', 'name')
+    sort_order = request.args.get('sort_order', 'asc')
+    fields = requested_fields()
     
-    # Query base
+    # Busca por lista de ids (?ids=1,2,3): sem paginação, na ordem pedida
+    try:
+        ids = requested_ids()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if ids is not None and fields is not None:
+        fields.add('id')  # necessário para ordenar a resposta
+    
+    # Query base (o estudante vem no mesmo JOIN, sem consulta por linha)
     query = db.session.query(MemberStatus).join(Student)
     
     # Filtro por dojos permitidos
@@ -38,8 +58,12 @@ def list_member_status():
     if allowed_dojos is not None:
         query = query.filter(Student.dojo_id.in_(allowed_dojos))
     
-    # Aplicar filtros
-    if search:
+    # Aplicar filtros (busca por nome e número de registro no índice FTS5 de
+    # alunos, como em /students; ilike sem o índice)
+    match = STUDENT_SEARCH.match(search, ['name', 'registered_number']) if search and STUDENT_SEARCH.available() else None
+    if match is not None:
+        query = query.join(match, match.c.rowid == MemberStatus.student_id)
+    elif search:
         query = query.filter(
             db.or_(
                 Student.name.ilike(f'%{search}%'),
@@ -59,16 +83,69 @@ def list_member_status():
     if student_id:
         query = query.filter(MemberStatus.student_id == student_id)
     
-    # Ordenação
+    if ids is not None:
+        query = query.filter(MemberStatus.id.in_(ids))
+    
+    # Filtros por graduação atual: pelo nível (indexado, único por disciplina)
+    # e pelo nome, que só confere as linhas encontradas no índice
+    if aikido_rank:
+        query = query.filter(
+            MemberStatus.aikido_rank_level == MemberGraduation.get_rank_level('Shinshin Toitsu Aikido', aikido_rank),
+            MemberStatus.aikido_rank_name == aikido_rank
+        )
+    
+    if toitsudo_rank:
+        query = query.filter(
+            MemberStatus.toitsudo_rank_level == MemberGraduation.get_rank_level('Shinshin Toitsudo', toitsudo_rank),
+            MemberStatus.toitsudo_rank_name == toitsudo_rank
+        )
+    
+    # Ordenação (com busca e sem sort_by, por relevância)
+    if match is not None and 'sort_by' not in request.args:
+        query = query.order_by(match.c.rank)
+    elif sort_by == 'aikido_rank':
+        query = query.order_by(MemberStatus.aikido_rank_level.asc() if sort_order == 'asc' else MemberStatus.aikido_rank_level.desc())
+    elif sort_by == 'toitsudo_rank':
+        query = query.order_by(MemberStatus.toitsudo_rank_level.asc() if sort_order == 'asc' else MemberStatus.toitsudo_rank_level.desc())
     query = query.order_by(Student.name)
     
+    # Caminho rápido: tuplas de colunas em vez de objetos ORM
+    fast = row_serializers_enabled()
+    if fast:
+        query = MEMBER_STATUS_ROWS.select(query, fields)
+    else:
+        query = query.options(contains_eager(MemberStatus.student))
+    
+    if ids is not None:
+        items = query.all()
+        members = MEMBER_STATUS_ROWS.serialize(items, fields) if fast else [pick(ms.to_summary(), fields) for ms in items]
+        members, missing = in_request_order(members, ids)
+        return json_response({'members': members, 'missing': missing})
+    
+    # Paginação por cursor (?cursor=): nome do aluno e id depois da última linha, sem OFFSET
+    if cursor_requested():
+        # Sem sort_by, a busca ordena por relevância, que o cursor não percorre
+        if sort_by != 'name' or (match is not None and 'sort_by' not in request.args):
+            return jsonify({'error': 'Paginação por cursor disponível apenas com sort_by=name'}), 400
+        try:
+            items, pagination = keyset_page(query, [Student.name, MemberStatus.id], per_page, entity=not fast)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        members = MEMBER_STATUS_ROWS.serialize(items, fields) if fast else [pick(ms.to_summary(), fields) for ms in items]
+        return json_response({'members': members, 'pagination': pagination})
+    
     # Paginação
     pagination = query.paginate(
         page=page, per_page=per_page, error_out=False
     )
     
-    return jsonify({
-        'members': [ms.to_summary() for ms in pagination.items],
+    if fast:
+        members = MEMBER_STATUS_ROWS.serialize(pagination.items, fields)
+    else:
+        members = [pick(ms.to_summary(), fields) for ms in pagination.items]
+    
+    return json_response({
+        'members': members,
         'pagination': {
             'page': page,
             'per_page': per_page,
@@ -84,14 +161,79 @@ def list_member_status():
 def get_member_status(id):
     """Retorna detalhes de um status de membro específico"""
     
-    member_status = MemberStatus.query.get_or_404(id)
+    fields = requested_fields()
+    member_status = MemberStatus.query.options(
+        *related_options(MemberStatus, fields)
+    ).filter_by(id=id).first_or_404()
     
     # Verificar permissão
     allowed_dojos = get_user_dojos()
     if allowed_dojos is not None and member_status.student.dojo_id not in allowed_dojos:
         return jsonify({'error': 'Acesso negado'}), 403
     
-    return jsonify(member_status.to_dict())
+    return jsonify(member_status.to_dict(fields))
+
+@member_status_bp.route('/member-status/<int:id>/profile', methods=['GET'])
+@login_required
+def get_member_profile(id):
+    """
+    Retorna o perfil completo de um membro em uma única resposta
+    
+    Inclui status, cadastro do estudante, histórico de graduações,
+    qualificações e metadados dos documentos, com uma única verificação de
+    permissão e número fixo de consultas (membro com estudante e dojo,
+    graduações, qualificações e documentos).
+    """
+    
+    member_status = db.session.query(MemberStatus).join(Student).options(
+        contains_eager(MemberStatus.student).joinedload(Student.dojo)
+    ).filter(MemberStatus.id == id).first_or_404()
+    student = member_status.student
+    
+    # Verificar permissão
+    allowed_dojos = get_user_dojos()
+    if allowed_dojos is not None and student.dojo_id not in allowed_dojos:
+        return jsonify({'error': 'Acesso negado'}), 403
+    
+    # Mesma ordenação das listagens de graduações e qualificações
+    graduations = MemberGraduation.query.filter_by(member_status_id=id).order_by(
+        MemberGraduation.discipline,
+        MemberGraduation.rank_level.desc(),
+        MemberGraduation.examination_date.desc()
+    ).all()
+    
+    qualifications = MemberQualification.query.filter_by(member_status_id=id).order_by(
+        MemberQualification.qualification_type,
+        MemberQualification.date_obtained.desc()
+    ).all()
+    
+    # Relacionamentos já conhecidos: to_dict() não dispara novas consultas
+    set_committed_value(member_status, 'graduations', graduations)
+    set_committed_value(member_status, 'qualifications', qualifications)
+    set_committed_value(student, 'member_status', member_status)
+    
+    # Foto do membro e certificados das graduações e qualificações
+    documents = DocumentAttachment.query.filter(
+        db.or_(
+            db.and_(DocumentAttachment.document_type == 'member_photo', DocumentAttachment.related_id == id),
+            db.and_(DocumentAttachment.document_type == 'graduation', DocumentAttachment.related_id.in_([g.id for g in graduations])),
+            db.and_(DocumentAttachment.document_type == 'qualification', DocumentAttachment.related_id.in_([q.id for q in qualifications]))
+        )
+    ).order_by(DocumentAttachment.uploaded_at.desc())
+    
+    if row_serializers_enabled():
+        documents_data = DOCUMENT_ROWS.serialize(DOCUMENT_ROWS.select(documents).all())
+    else:
+        documents = documents.options(*related_options(DocumentAttachment, None))
+        documents_data = [doc.to_dict() for doc in documents]
+    
+    return json_response({
+        'member': member_status.to_dict(),
+        'student': student.to_dict(),
+        'graduations': [grad.to_dict() for grad in graduations],
+        'qualifications': [qual.to_dict() for qual in qualifications],
+        'documents': documents_data
+    })
 
 @member_status_bp.route('/member-status', methods=['POST'])
 @login_required
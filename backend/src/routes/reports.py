@@ -4,106 +4,167 @@ Sistema Ki Aikido - Sprint 4
 """
 
 from flask import Blueprint, request, jsonify
-from src.models import db, User, MemberStatus, MemberGraduation, MemberQualification, DocumentAttachment
+from src.models import db, User, Student, MemberStatus, MemberGraduation, MemberQualification, DocumentAttachment
 from src.routes.auth import login_required, get_current_user
+from src.utils.fields import related_options
+from src.utils.serializers import DOCUMENT_ROWS, row_serializers_enabled, json_response
 from sqlalchemy import func, and_, or_
 
 reports_bp = Blueprint('reports', __name__)
 
+# Seções do relatório de pendências
+PENDING_SECTIONS = (
+    'members_without_photo',
+    'graduations_without_certificate',
+    'qualifications_without_certificate',
+    'unverified_documents'
+)
+
+def _empty(column):
+    """Coluna de arquivo sem valor (NULL ou vazia)"""
+    return or_(column == None, column == '')
+
+def _pending_members(dojo_filter):
+    query = db.session.query(
+        MemberStatus.id,
+        MemberStatus.student_id,
+        Student.name.label('student_name'),
+        MemberStatus.registered_number,
+        MemberStatus.member_type
+    ).join(Student, MemberStatus.student_id == Student.id).filter(_empty(MemberStatus.photo_path))
+    
+    if dojo_filter:
+        query = query.filter(Student.dojo_id == dojo_filter)
+    
+    def serialize(rows):
+        return [{
+            'id': row.id,
+            'student_id': row.student_id,
+            'student_name': row.student_name,
+            'registered_number': row.registered_number,
+            'member_type': row.member_type,
+            'member_type_display': MemberStatus.MEMBER_TYPES.get(row.member_type, row.member_type)
+        } for row in rows]
+    
+    return query.order_by(Student.name, MemberStatus.id), serialize
+
+def _pending_graduations(dojo_filter):
+    query = db.session.query(
+        MemberGraduation.id,
+        MemberGraduation.member_status_id,
+        Student.name.label('student_name'),
+        MemberGraduation.discipline,
+        MemberGraduation.rank_name,
+        MemberGraduation.examination_date
+    ).join(
+        MemberStatus, MemberGraduation.member_status_id == MemberStatus.id
+    ).join(Student, MemberStatus.student_id == Student.id).filter(_empty(MemberGraduation.document_path))
+    
+    if dojo_filter:
+        query = query.filter(Student.dojo_id == dojo_filter)
+    
+    def serialize(rows):
+        return [{
+            'id': row.id,
+            'member_status_id': row.member_status_id,
+            'student_name': row.student_name,
+            'discipline': row.discipline,
+            'rank_name': row.rank_name,
+            'rank_display': MemberGraduation.get_rank_display(row.discipline, row.rank_name),
+            'examination_date': row.examination_date
+        } for row in rows]
+    
+    return query.order_by(Student.name, MemberGraduation.id), serialize
+
+def _pending_qualifications(dojo_filter):
+    query = db.session.query(
+        MemberQualification.id,
+        MemberQualification.member_status_id,
+        Student.name.label('student_name'),
+        MemberQualification.qualification_type,
+        MemberQualification.qualification_level,
+        MemberQualification.date_obtained
+    ).join(
+        MemberStatus, MemberQualification.member_status_id == MemberStatus.id
+    ).join(Student, MemberStatus.student_id == Student.id).filter(_empty(MemberQualification.document_path))
+    
+    if dojo_filter:
+        query = query.filter(Student.dojo_id == dojo_filter)
+    
+    def serialize(rows):
+        return [{
+            'id': row.id,
+            'member_status_id': row.member_status_id,
+            'student_name': row.student_name,
+            'qualification_type': row.qualification_type,
+            'qualification_type_display': MemberQualification.QUALIFICATION_TYPES.get(row.qualification_type, row.qualification_type),
+            'qualification_level': row.qualification_level,
+            'date_obtained': row.date_obtained
+        } for row in rows]
+    
+    return query.order_by(Student.name, MemberQualification.id), serialize
+
+def _unverified_documents(dojo_filter):
+    query = DocumentAttachment.query.filter_by(is_verified=False).order_by(
+        DocumentAttachment.uploaded_at.desc(), DocumentAttachment.id.desc()
+    )
+    
+    if row_serializers_enabled():
+        return DOCUMENT_ROWS.select(query), DOCUMENT_ROWS.serialize
+    
+    query = query.options(*related_options(DocumentAttachment, None))
+    return query, lambda documents: [doc.to_dict() for doc in documents]
+
 @reports_bp.route('/reports/documents/pending', methods=['GET'])
 @login_required
 def get_pending_documents():
-    """Relatório de documentos pendentes (não enviados ou não verificados)"""
+    """
+    Relatório de documentos pendentes (não enviados ou não verificados)
+    
+    Cada seção é paginada (page/per_page) e lida como tuplas de colunas com
+    o nome do membro no mesmo JOIN; os totais vêm de COUNT. Com ?section=
+    apenas a seção informada é calculada (para "carregar mais").
+    """
     user = get_current_user()
     if not user:
         return jsonify({'error': 'Usuário não encontrado'}), 404
     
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = max(1, min(request.args.get('per_page', 50, type=int), 200))
+    section = request.args.get('section', '').strip()
+    
+    if section and section not in PENDING_SECTIONS:
+        return jsonify({'error': f'Seção inválida: {section}'}), 400
+    
     # Filtro por dojo (se não for admin)
     dojo_filter = user.dojo_id if user.role != 'admin' else None
     
-    report = {
-        'members_without_photo': [],
-        'graduations_without_certificate': [],
-        'qualifications_without_certificate': [],
-        'unverified_documents': []
+    builders = {
+        'members_without_photo': _pending_members,
+        'graduations_without_certificate': _pending_graduations,
+        'qualifications_without_certificate': _pending_qualifications
     }
-    
-    # Membros sem foto
-    query = db.session.query(MemberStatus).join(MemberStatus.student)
-    if dojo_filter:
-        query = query.filter(MemberStatus.student.has(dojo_id=dojo_filter))
-    
-    members_without_photo = query.filter(
-        or_(MemberStatus.photo_path == None, MemberStatus.photo_path == '')
-    ).all()
-    
-    report['members_without_photo'] = [{
-        'id': m.id,
-        'student_id': m.student_id,
-        'student_name': m.student.name if m.student else 'N/A',
-        'registered_number': m.registered_number,
-        'member_type': m.member_type,
-        'member_type_display': MemberStatus.MEMBER_TYPES.get(m.member_type, m.member_type)
-    } for m in members_without_photo]
-    
-    # Graduações sem certificado
-    query = db.session.query(MemberGraduation).join(
-        MemberStatus, MemberGraduation.member_status_id == MemberStatus.id
-    ).join(MemberStatus.student)
-    
-    if dojo_filter:
-        query = query.filter(MemberStatus.student.has(dojo_id=dojo_filter))
-    
-    graduations_without_cert = query.filter(
-        or_(MemberGraduation.document_path == None, MemberGraduation.document_path == '')
-    ).all()
-    
-    report['graduations_without_certificate'] = [{
-        'id': g.id,
-        'member_status_id': g.member_status_id,
-        'student_name': g.member_status.student.name if g.member_status and g.member_status.student else 'N/A',
-        'discipline': g.discipline,
-        'rank_name': g.rank_name,
-        'rank_display': MemberGraduation.get_rank_display(g.discipline, g.rank_name),
-        'examination_date': g.examination_date.isoformat() if g.examination_date else None
-    } for g in graduations_without_cert]
-    
-    # Qualificações sem certificado
-    query = db.session.query(MemberQualification).join(
-        MemberStatus, MemberQualification.member_status_id == MemberStatus.id
-    ).join(MemberStatus.student)
-    
-    if dojo_filter:
-        query = query.filter(MemberStatus.student.has(dojo_id=dojo_filter))
-    
-    qualifications_without_cert = query.filter(
-        or_(MemberQualification.document_path == None, MemberQualification.document_path == '')
-    ).all()
-    
-    report['qualifications_without_certificate'] = [{
-        'id': q.id,
-        'member_status_id': q.member_status_id,
-        'student_name': q.member_status.student.name if q.member_status and q.member_status.student else 'N/A',
-        'qualification_type': q.qualification_type,
-        'qualification_type_display': MemberQualification.QUALIFICATION_TYPES.get(q.qualification_type, q.qualification_type),
-        'qualification_level': q.qualification_level,
-        'date_obtained': q.date_obtained.isoformat() if q.date_obtained else None
-    } for q in qualifications_without_cert]
-    
     # Documentos não verificados (apenas admin pode ver)
     if user.role == 'admin':
-        unverified = DocumentAttachment.query.filter_by(is_verified=False).all()
-        report['unverified_documents'] = [doc.to_dict() for doc in unverified]
-    
-    # Estatísticas
-    report['statistics'] = {
-        'total_members_without_photo': len(report['members_without_photo']),
-        'total_graduations_without_certificate': len(report['graduations_without_certificate']),
-        'total_qualifications_without_certificate': len(report['qualifications_without_certificate']),
-        'total_unverified_documents': len(report['unverified_documents'])
-    }
+        builders['unverified_documents'] = _unverified_documents
+    
+    report = {}
+    statistics = {}
+    for name in ([section] if section else PENDING_SECTIONS):
+        if name not in builders:
+            report[name] = []
+            statistics[f'total_{name}'] = 0
+            continue
+        
+        query, serialize = builders[name](dojo_filter)
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        report[name] = serialize(pagination.items)
+        statistics[f'total_{name}'] = pagination.total
+    
+    report['statistics'] = statistics
+    report['pagination'] = {'page': page, 'per_page': per_page}
     
-    return jsonify(report), 200
+    return json_response(report), 200
 
 @reports_bp.route('/reports/documents/statistics', methods=['GET'])
 @login_required
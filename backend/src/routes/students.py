@@ -1,11 +1,25 @@
 from flask import Blueprint, request, jsonify
-from src.models import db, Student, Dojo
+from src.models import db, Student, Dojo, MemberStatus
 from src.routes.auth import login_required, get_current_user, admin_required
+from src.utils.fields import requested_fields, related_options
+from src.utils.serializers import STUDENT_ROWS, row_serializers_enabled, json_response
+from src.utils.multiget import requested_ids, in_request_order
+from src.utils.search import STUDENT_SEARCH
+from src.utils.pagination import cursor_requested, keyset_page
 from datetime import datetime
 import re
 
 students_bp = Blueprint('students', __name__)
 
+def student_list_options(fields=None):
+    """
+    Estratégia de carga das listagens de Student.to_dict(): dojo e member_status
+    são carregados em lote (uma consulta por relacionamento para a página
+    inteira) em vez de uma consulta por linha, e apenas se algum campo pedido
+    depender deles
+    """
+    return related_options(Student, fields)
+
 @students_bp.route('/students', methods=['GET'])
 @login_required
 def get_students():
@@ -20,6 +34,15 @@ def get_students():
         per_page = request.args.get('per_page', 20, type=int)
         search = request.args.get('search', '').strip()
         dojo_id = request.args.get('dojo_id', type=int)
+        fields = requested_fields()
+        
+        # Busca por lista de ids (?ids=1,2,3): sem paginação, na ordem pedida
+        try:
+            ids = requested_ids()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if ids is not None and fields is not None:
+            fields.add('id')  # necessário para ordenar a resposta
         
         # Query base
         query = Student.query
@@ -30,8 +53,12 @@ def get_students():
         elif dojo_id:  # Admin pode filtrar por dojo específico
             query = query.filter(Student.dojo_id == dojo_id)
         
-        # Filtro por busca (nome, email, número de registro)
-        if search:
+        # Filtro por busca (nome, email, número de registro): índice FTS5 com
+        # prefixos e sem acentos, ordenado por relevância; ilike sem o índice
+        match = STUDENT_SEARCH.match(search) if search and STUDENT_SEARCH.available() else None
+        if match is not None:
+            query = query.join(match, match.c.rowid == Student.id).order_by(match.c.rank)
+        elif search:
             search_filter = f"%{search}%"
             query = query.filter(
                 db.or_(
@@ -41,9 +68,34 @@ def get_students():
                 )
             )
         
+        if ids is not None:
+            query = query.filter(Student.id.in_(ids))
+        
         # Ordenação
         query = query.order_by(Student.name.asc())
         
+        # Caminho rápido: tuplas de colunas em vez de objetos ORM
+        fast = row_serializers_enabled()
+        if fast:
+            query = STUDENT_ROWS.select(query, fields)
+        else:
+            query = query.options(*student_list_options(fields))
+        
+        if ids is not None:
+            items = query.all()
+            students = STUDENT_ROWS.serialize(items, fields) if fast else [student.to_dict(fields) for student in items]
+            students, missing = in_request_order(students, ids)
+            return json_response({'students': students, 'missing': missing}), 200
+        
+        # Paginação por cursor (?cursor=): nome e id depois da última linha, sem OFFSET
+        if cursor_requested():
+            try:
+                items, pagination = keyset_page(query, [Student.name, Student.id], per_page, entity=not fast)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            students = STUDENT_ROWS.serialize(items, fields) if fast else [student.to_dict(fields) for student in items]
+            return json_response({'students': students, 'pagination': pagination}), 200
+        
         # Paginação
         pagination = query.paginate(
             page=page, 
@@ -51,9 +103,12 @@ def get_students():
             error_out=False
         )
         
-        students = [student.to_dict() for student in pagination.items]
+        if fast:
+            students = STUDENT_ROWS.serialize(pagination.items, fields)
+        else:
+            students = [student.to_dict(fields) for student in pagination.items]
         
-        return jsonify({
+        return json_response({
             'students': students,
             'pagination': {
                 'page': page,
@@ -68,6 +123,54 @@ def get_students():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@students_bp.route('/students/lookup', methods=['GET'])
+@login_required
+def lookup_students():
+    """
+    Busca por prefixo do nome para seletores (typeahead)
+    
+    Compara o prefixo normalizado (sem acentos, minúsculas) com
+    name_normalized: cada chamada é uma varredura de intervalo no índice,
+    limitada por limit, e retorna apenas os campos do seletor.
+    """
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        prefix = Student.normalize_name(request.args.get('q', '')) or ''
+        limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+        
+        query = db.session.query(
+            Student.id,
+            Student.name,
+            Student.registration_number,
+            MemberStatus.id.isnot(None).label('has_member_status')
+        ).outerjoin(MemberStatus, MemberStatus.student_id == Student.id)
+        
+        # Controle de acesso: usuário de dojo vê apenas seu dojo
+        if not current_user.is_admin():
+            query = query.filter(Student.dojo_id == current_user.dojo_id)
+        
+        # Intervalo [prefixo, prefixo + maior caractere) equivale a "começa com" e usa o índice
+        if prefix:
+            query = query.filter(
+                Student.name_normalized >= prefix,
+                Student.name_normalized < prefix + '\U0010ffff'
+            )
+        
+        rows = query.order_by(Student.name_normalized).limit(limit).all()
+        
+        return jsonify({'students': [{
+            'id': row.id,
+            'name': row.name,
+            'registration_number': row.registration_number,
+            'has_member_status': row.has_member_status
+        } for row in rows]}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @students_bp.route('/students/<int:student_id>', methods=['GET'])
 @login_required
 def get_student(student_id):
@@ -85,7 +188,7 @@ def get_student(student_id):
         if not current_user.can_access_dojo(student.dojo_id):
             return jsonify({'error': 'Access denied'}), 403
         
-        return jsonify({'student': student.to_dict()}), 200
+        return jsonify({'student': student.to_dict(requested_fields())}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
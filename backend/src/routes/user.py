@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import User, db
+from src.models import Event, DocumentAttachment
 from src.routes.auth import login_required, admin_required, get_current_user
 
 user_bp = Blueprint('user', __name__)
@@ -108,6 +109,25 @@ def delete_user(user_id):
         if current.id == user_id:
             return jsonify({'error': 'Cannot delete your own account'}), 400
         
+        # Eventos criados e documentos enviados exigem o autor (NOT NULL)
+        event_count = Event.query.filter_by(created_by=user_id).count()
+        if event_count > 0:
+            return jsonify({
+                'error': f'Cannot delete user. There are {event_count} event(s) created by this user. Please delete them first.'
+            }), 400
+        
+        document_count = DocumentAttachment.query.filter_by(uploaded_by_user_id=user_id).count()
+        if document_count > 0:
+            return jsonify({
+                'error': f'Cannot delete user. There are {document_count} document(s) uploaded by this user. Please delete them first.'
+            }), 400
+        
+        # Documentos verificados pelo usuário continuam verificados, sem o verificador
+        # (chave estrangeira aplicada com foreign_keys=ON)
+        DocumentAttachment.query.filter_by(verified_by_user_id=user_id).update(
+            {'verified_by_user_id': None}, synchronize_session=False
+        )
+        
         db.session.delete(user)
         db.session.commit()
         return '', 204
@@ -7,6 +7,7 @@ from .image_utils import (
     create_all_thumbnails,
     THUMBNAIL_SIZES
 )
+from .recurrence import RecurrenceRule
 
 __all__ = [
     'create_thumbnail',
@@ -14,5 +15,6 @@ __all__ = [
     'get_image_info',
     'is_valid_image',
     'create_all_thumbnails',
-    'THUMBNAIL_SIZES'
+    'THUMBNAIL_SIZES',
+    'RecurrenceRule'
 ]
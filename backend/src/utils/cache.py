@@ -0,0 +1,82 @@
+"""
+Cache em memória para resultados agregados
+Sistema Ki Aikido
+
+Cache simples por processo, com expiração (TTL) e invalidação automática
+quando um commit grava alterações nos modelos observados.
+"""
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+
+class TTLCache:
+    """Dicionário com expiração por entrada, seguro para uso entre threads"""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_set(self, key, factory):
+        """Retorna o valor em cache ou calcula com factory() e guarda"""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_SESSION_KEY = 'caches_to_clear'
+
+
+def invalidate_on_commit(cache, *models):
+    """
+    Limpa o cache após o commit de qualquer inserção, alteração ou remoção
+    dos modelos informados (via ORM)
+
+    Args:
+        cache: Instância de TTLCache
+        models: Classes de modelo observadas
+    """
+    def mark(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_SESSION_KEY, set()).add(cache)
+
+    for model in models:
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, name, mark)
+
+
+@event.listens_for(Session, 'after_commit')
+def _clear_marked_caches(session):
+    for cache in session.info.pop(_SESSION_KEY, ()):
+        cache.clear()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_marked_caches(session):
+    session.info.pop(_SESSION_KEY, None)
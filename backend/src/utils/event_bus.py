@@ -0,0 +1,82 @@
+"""
+Barramento de mudanças em memória para notificações push (SSE)
+Sistema Ki Aikido
+
+As rotas publicam mensagens depois do commit; cada cliente conectado ao
+stream tem uma fila própria e fica bloqueado nela até chegar uma mensagem
+do seu escopo. Clientes ociosos não consomem consultas nem processamento.
+"""
+
+import queue
+import threading
+
+
+class Subscription:
+    """Fila de mensagens de um cliente conectado"""
+
+    def __init__(self, dojo_id=None, maxsize=100):
+        self.dojo_id = dojo_id  # None = recebe tudo (admin)
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def accepts(self, dojo_id):
+        """Mensagens gerais (dojo_id None) vão para todos; as de dojo, para o dojo e para admins"""
+        return self.dojo_id is None or dojo_id is None or dojo_id == self.dojo_id
+
+    def get(self, timeout=None):
+        """Próxima mensagem, ou None se o timeout expirar"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class ChangeBus:
+    """Distribui mensagens para as assinaturas conforme o dojo"""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, dojo_id=None):
+        subscription = Subscription(dojo_id)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def add_listener(self, callback):
+        """Registra uma função chamada a cada publicação (ex: acordar o ticker de avisos)"""
+        self._listeners.append(callback)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+    def publish(self, kind, data, dojo_id=None):
+        """
+        Publica uma mensagem
+
+        Args:
+            kind: Nome do evento SSE (ex: 'calendar', 'reminder')
+            data: Dados serializáveis em JSON
+            dojo_id: Dojo da mensagem (None = geral)
+        """
+        message = {'kind': kind, 'data': data}
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.accepts(dojo_id)]
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                # Cliente lento: descarta a mensagem em vez de acumular memória
+                pass
+        for callback in self._listeners:
+            callback(kind, data, dojo_id)
+
+
+# Instância única do processo
+change_bus = ChangeBus()
@@ -0,0 +1,50 @@
+"""
+Seleção de campos das respostas (?fields=)
+Sistema Ki Aikido
+
+Com ?fields=id,name a rota gera apenas as chaves pedidas. Os modelos
+declaram em RELATED_FIELDS quais chaves de to_dict() dependem de
+relacionamentos; só esses relacionamentos são carregados (em lote) e os
+demais nunca são acessados.
+"""
+
+from flask import request
+from sqlalchemy.orm import selectinload
+
+
+def requested_fields():
+    """Campos pedidos em ?fields= (None = todos)"""
+    fields = {name.strip() for name in request.args.get('fields', '').split(',') if name.strip()}
+    return fields or None
+
+
+def wants(fields, name):
+    """Indica se a chave deve ser gerada"""
+    return fields is None or name in fields
+
+
+def pick(data, fields):
+    """Mantém apenas as chaves pedidas"""
+    if fields is None:
+        return data
+    return {key: value for key, value in data.items() if key in fields}
+
+
+def related_options(model, fields, loader=selectinload):
+    """
+    Opções de carga dos relacionamentos usados pelos campos pedidos
+
+    Args:
+        model: Classe do modelo (com RELATED_FIELDS)
+        fields: Valor de requested_fields()
+        loader: Estratégia de carga (padrão: selectinload)
+
+    Returns:
+        Lista de opções para Query.options()
+    """
+    relationships = {
+        relationship
+        for field, names in model.RELATED_FIELDS.items() if wants(fields, field)
+        for relationship in names
+    }
+    return [loader(getattr(model, name)) for name in sorted(relationships)]
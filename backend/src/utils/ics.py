@@ -0,0 +1,231 @@
+"""
+Geração de calendários iCalendar (RFC 5545)
+Sistema Ki Aikido
+
+Eventos recorrentes são exportados como um único VEVENT com RRULE; as
+ocorrências suspensas ou canceladas viram EXDATE e as ocorrências com
+dados sobrescritos viram VEVENTs com RECURRENCE-ID.
+
+Os horários dos eventos são armazenados sem fuso (horário local do dojo,
+como digitado no formulário) e exportados como horário flutuante, sem o
+sufixo Z: o calendário do assinante mostra o mesmo horário digitado. Só
+DTSTAMP e LAST-MODIFIED (gravados com utcnow) são exportados em UTC.
+"""
+
+from datetime import datetime, timedelta
+
+from src.utils.recurrence import RecurrenceRule
+
+PRODID = '-//Ki Aikido//Calendario de Eventos//PT'
+
+_FREQUENCIES = {
+    'daily': 'DAILY',
+    'weekly': 'WEEKLY',
+    'monthly': 'MONTHLY',
+    'yearly': 'YEARLY'
+}
+
+# datetime.weekday(): 0=segunda ... 6=domingo
+_WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+_STATUSES = {
+    'active': 'CONFIRMED',
+    'completed': 'CONFIRMED',
+    'suspended': 'CANCELLED',
+    'cancelled': 'CANCELLED'
+}
+
+
+def escape_text(value):
+    """Escapa um valor de texto (TEXT) do iCalendar"""
+    return (
+        (value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Quebra a linha em blocos de até 75 octetos, terminando em CRLF"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+
+    parts = []
+    current = ''
+    size = 0
+    limit = 75
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        if size + char_size > limit:
+            parts.append(current)
+            current = ''
+            size = 0
+            limit = 74  # as linhas de continuação começam com um espaço
+        current += char
+        size += char_size
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def format_datetime(value):
+    """Data e hora local sem fuso (horário flutuante)"""
+    return value.strftime('%Y%m%dT%H%M%S')
+
+
+def format_utc(value):
+    """Data e hora em UTC (DTSTAMP, LAST-MODIFIED)"""
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+def format_date(value):
+    return value.strftime('%Y%m%d')
+
+
+def _timing(event, start, end):
+    """Propriedades DTSTART/DTEND (dia inteiro usa VALUE=DATE com fim exclusivo)"""
+    if event.all_day:
+        return [
+            f'DTSTART;VALUE=DATE:{format_date(start)}',
+            f'DTEND;VALUE=DATE:{format_date(end.date() + timedelta(days=1))}'
+        ]
+    return [f'DTSTART:{format_datetime(start)}', f'DTEND:{format_datetime(end)}']
+
+
+def _instance_property(name, event, occurrence_date):
+    """Propriedade que referencia uma ocorrência (EXDATE, RECURRENCE-ID)"""
+    if event.all_day:
+        return f'{name};VALUE=DATE:{format_date(occurrence_date)}'
+    return f'{name}:{format_datetime(occurrence_date)}'
+
+
+def recurrence_rule(event):
+    """
+    Monta o valor de RRULE a partir dos campos de recorrência do evento
+
+    Returns:
+        String da regra (ex: "FREQ=WEEKLY;BYDAY=TU,TH") ou None
+    """
+    frequency = _FREQUENCIES.get(event.recurrence_pattern)
+    if not event.is_recurring or not frequency:
+        return None
+
+    rule = RecurrenceRule.from_event(event)
+    parts = [f'FREQ={frequency}']
+
+    if rule.by_weekday:
+        # Semanal com dias específicos: o intervalo é ignorado (como no motor de recorrência)
+        parts.append('BYDAY=' + ','.join(_WEEKDAYS[day] for day in rule.weekdays))
+    elif rule.interval > 1:
+        parts.append(f'INTERVAL={rule.interval}')
+
+    # Séries que terminam por contagem ou no primeiro mês sem o dia inicial
+    # (ex: dia 31) são exportadas com COUNT exato; UNTIL e COUNT são exclusivos
+    if rule.max_count is not None:
+        count = rule.max_count if not rule.until else sum(1 for _ in rule.iter_dates())
+        parts.append(f'COUNT={count}')
+    elif rule.until:
+        # UNTIL tem o mesmo tipo do DTSTART (data ou horário flutuante)
+        until = format_date(rule.until) if event.all_day else format_datetime(rule.until)
+        parts.append(f'UNTIL={until}')
+
+    return ';'.join(parts)
+
+
+def series_timing(event):
+    """
+    Início e fim da primeira ocorrência da série, usados em DTSTART/DTEND
+
+    No RFC 5545 o DTSTART é sempre uma ocorrência, mesmo fora dos dias do
+    BYDAY; no motor de recorrência a série semanal com dias começa no
+    primeiro desses dias a partir da data inicial. Nesse caso o DTSTART
+    exportado é essa primeira ocorrência, mantendo a duração do evento.
+    """
+    start, end = event.start_datetime, event.end_datetime
+    if recurrence_rule(event):
+        rule = RecurrenceRule.from_event(event)
+        if rule.by_weekday:
+            first = rule.date_at(0)
+            return first, end + (first - start)
+    return start, end
+
+
+def render_event(event, exceptions=(), stamp=None):
+    """
+    Gera o texto (com linhas já dobradas) dos VEVENTs de um evento
+
+    Args:
+        event: Evento (Event)
+        exceptions: Ocorrências armazenadas com alterações (EventOccurrence)
+        stamp: Valor de DTSTAMP (padrão: agora)
+    """
+    stamp = format_utc(stamp or datetime.utcnow())
+    uid = f'event-{event.id}@kiaikido'
+    rrule = recurrence_rule(event)
+    start, end = series_timing(event)
+
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f'DTSTAMP:{stamp}',
+        *_timing(event, start, end),
+        f'SUMMARY:{escape_text(event.title)}',
+        f'STATUS:{_STATUSES.get(event.status, "CONFIRMED")}'
+    ]
+    if event.description:
+        lines.append(f'DESCRIPTION:{escape_text(event.description)}')
+    if event.location:
+        lines.append(f'LOCATION:{escape_text(event.location)}')
+    if event.category:
+        lines.append(f'CATEGORIES:{escape_text(event.category)}')
+    if event.updated_at:
+        lines.append(f'LAST-MODIFIED:{format_utc(event.updated_at)}')
+
+    overrides = []
+    if rrule:
+        lines.append(f'RRULE:{rrule}')
+        for occurrence in exceptions:
+            if occurrence.status in ('suspended', 'cancelled'):
+                lines.append(_instance_property('EXDATE', event, occurrence.occurrence_date))
+            elif occurrence.override_title or occurrence.override_description or occurrence.override_location:
+                overrides.append(occurrence)
+            # demais (ex: realizada, sem alterações) seguem a própria RRULE
+    lines.append('END:VEVENT')
+
+    for occurrence in overrides:
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:{uid}',
+            f'DTSTAMP:{stamp}',
+            _instance_property('RECURRENCE-ID', event, occurrence.occurrence_date),
+            *_timing(event, occurrence.occurrence_date, occurrence.end_datetime),
+            f'SUMMARY:{escape_text(occurrence.override_title or event.title)}',
+            f'STATUS:{_STATUSES.get(occurrence.status, "CONFIRMED")}'
+        ]
+        description = occurrence.override_description or event.description
+        location = occurrence.override_location or event.location
+        if description:
+            lines.append(f'DESCRIPTION:{escape_text(description)}')
+        if location:
+            lines.append(f'LOCATION:{escape_text(location)}')
+        lines.append('END:VEVENT')
+
+    return ''.join(fold(line) for line in lines)
+
+
+def calendar_header(name):
+    return ''.join(fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(name)}'
+    ])
+
+
+def calendar_footer():
+    return fold('END:VCALENDAR')
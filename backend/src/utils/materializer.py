@@ -0,0 +1,174 @@
+"""
+Materialização contínua de ocorrências de eventos recorrentes
+Sistema Ki Aikido
+
+No modo 'materialized' as ocorrências ficam gravadas em event_occurrences.
+Séries com recurrence_end_date são gravadas inteiras, até a data final. Nas
+séries abertas (sem data final), as escritas de eventos gravam apenas uma
+janela curta à frente (EVENT_WRITE_WINDOW_DAYS) e este job periódico as
+estende até o horizonte configurado (EVENT_MATERIALIZE_HORIZON_DAYS), inserindo em lote
+somente as datas que ainda faltam, e remove as ocorrências sem alterações
+mais antigas que a janela de retenção (EVENT_RETENTION_DAYS). A cada rodada
+também avança a janela do índice de disparo dos avisos das séries.
+"""
+
+from datetime import datetime, timedelta
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import or_, and_
+
+from src.models import db, Event, EventOccurrence
+from src.utils.recurrence import RecurrenceRule
+from src.utils.reminders import refresh_recurring_reminder_fires
+
+
+def _days(name):
+    return timedelta(days=int(current_app.config[name]))
+
+
+def retention_cutoff(now=None):
+    """Ocorrências anteriores a esta data não são mais materializadas"""
+    return (now or datetime.utcnow()) - _days('EVENT_RETENTION_DAYS')
+
+
+def materialization_end(event, ahead, now=None):
+    """
+    Última data materializada de uma série
+
+    Séries com recurrence_end_date vão até a data final. Nas séries abertas,
+    a janela é contada a partir de hoje (ou do início da série, se ainda
+    não começou).
+    """
+    if event.recurrence_end_date:
+        return event.recurrence_end_date
+    now = now or datetime.utcnow()
+    return max(now, event.start_datetime) + ahead
+
+
+def write_window_end(event, now=None):
+    """Fim da janela gravada diretamente na criação/edição do evento (séries abertas: janela curta)"""
+    return materialization_end(event, _days('EVENT_WRITE_WINDOW_DAYS'), now)
+
+
+def plain_occurrence_filter():
+    """Filtro SQL das ocorrências sem alterações (equivalente a not is_exception)"""
+    def empty(column):
+        return or_(column.is_(None), column == '')
+
+    return and_(
+        EventOccurrence.status == 'active',
+        empty(EventOccurrence.suspension_reason),
+        empty(EventOccurrence.override_title),
+        empty(EventOccurrence.override_description),
+        empty(EventOccurrence.override_location)
+    )
+
+
+def extend_occurrences(now=None):
+    """
+    Estende as séries recorrentes até o horizonte configurado
+
+    Returns:
+        Número de ocorrências inseridas
+    """
+    if current_app.config['EVENT_OCCURRENCE_MODE'] == 'virtual':
+        return 0
+
+    now = now or datetime.utcnow()
+    cutoff = retention_cutoff(now)
+    horizon = _days('EVENT_MATERIALIZE_HORIZON_DAYS')
+
+    events = Event.query.filter(
+        Event.is_recurring == True,
+        or_(Event.recurrence_end_date.is_(None), Event.recurrence_end_date >= cutoff)
+    ).all()
+    if not events:
+        return 0
+
+    # Dias já gravados dentro da janela, em uma única consulta
+    existing = {}
+    rows = db.session.query(EventOccurrence.event_id, EventOccurrence.occurrence_date).filter(
+        EventOccurrence.event_id.in_([event.id for event in events]),
+        EventOccurrence.occurrence_date >= cutoff
+    ).all()
+    for event_id, occurrence_date in rows:
+        existing.setdefault(event_id, set()).add(occurrence_date.date())
+
+    new_rows = []
+    for event in events:
+        window_end = materialization_end(event, horizon, now)
+        duration = event.end_datetime - event.start_datetime
+        known = existing.get(event.id, set())
+        for occurrence_date in RecurrenceRule.from_event(event).iter_dates(start=cutoff, end=window_end):
+            if occurrence_date.date() not in known:
+                new_rows.append({
+                    'event_id': event.id,
+                    'series_id': event.series_id,
+                    'occurrence_date': occurrence_date,
+                    'end_datetime': occurrence_date + duration,
+                    'status': 'active'
+                })
+
+    if new_rows:
+        db.session.execute(db.insert(EventOccurrence), new_rows)
+    return len(new_rows)
+
+
+def prune_occurrences(now=None):
+    """
+    Remove ocorrências sem alterações mais antigas que a janela de retenção
+
+    Ocorrências suspensas, canceladas ou sobrescritas são mantidas.
+
+    Returns:
+        Número de ocorrências removidas
+    """
+    result = db.session.execute(
+        db.delete(EventOccurrence).where(
+            EventOccurrence.occurrence_date < retention_cutoff(now),
+            plain_occurrence_filter()
+        )
+    )
+    return result.rowcount
+
+
+def run_materializer(now=None):
+    """Executa uma rodada completa (extensão, limpeza e índice de avisos) e grava o resultado"""
+    try:
+        inserted = extend_occurrences(now)
+        pruned = prune_occurrences(now)
+        reminder_fires = refresh_recurring_reminder_fires(now)
+        db.session.commit()
+        return {'inserted': inserted, 'pruned': pruned, 'reminder_fires': reminder_fires}
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def start_materializer(app):
+    """
+    Inicia o job em uma thread de fundo, a cada EVENT_MATERIALIZER_INTERVAL segundos
+
+    Returns:
+        A thread iniciada, ou None se o job estiver desabilitado (intervalo 0)
+    """
+    interval = int(app.config['EVENT_MATERIALIZER_INTERVAL'])
+    if interval <= 0:
+        return None
+
+    def loop():
+        while True:
+            with app.app_context():
+                try:
+                    run_materializer()
+                except Exception as e:
+                    print(f"Erro ao materializar ocorrências: {e}")
+                finally:
+                    db.session.remove()
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name='occurrence-materializer', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,48 @@
+"""
+Busca de vários registros por lista de ids (?ids=1,2,3)
+Sistema Ki Aikido
+
+Substitui N requisições de detalhe por uma consulta IN; a resposta segue a
+ordem dos ids informados.
+"""
+
+from flask import request
+
+# Limite de ids por requisição
+MAX_IDS = 100
+
+
+def requested_ids():
+    """
+    Ids pedidos em ?ids= (sem repetições, na ordem informada)
+
+    Returns:
+        Lista de ids, ou None se o parâmetro não foi enviado
+
+    Raises:
+        ValueError: Id inválido ou mais de MAX_IDS ids
+    """
+    value = request.args.get('ids')
+    if value is None:
+        return None
+
+    parts = [part.strip() for part in value.split(',') if part.strip()]
+    for part in parts:
+        if not part.isdigit():
+            raise ValueError(f'Id inválido: {part}')
+
+    ids = list(dict.fromkeys(int(part) for part in parts))
+    if len(ids) > MAX_IDS:
+        raise ValueError(f'Máximo de {MAX_IDS} ids por requisição')
+    return ids
+
+
+def in_request_order(items, ids, key=lambda item: item['id']):
+    """
+    Ordena os itens conforme a lista de ids
+
+    Returns:
+        Tupla (itens ordenados, ids não encontrados)
+    """
+    by_id = {key(item): item for item in items}
+    return [by_id[i] for i in ids if i in by_id], [i for i in ids if i not in by_id]
@@ -0,0 +1,139 @@
+"""
+Paginação por cursor (keyset) das listagens
+Sistema Ki Aikido
+
+Com ?cursor= a listagem não usa OFFSET nem COUNT: cada página filtra
+(chave de ordenação, id) depois da última linha da página anterior, uma
+busca de intervalo no índice que custa o mesmo na primeira e na milésima
+página. O cursor é opaco (assinado com a SECRET_KEY) e a resposta traz
+next_cursor enquanto houver mais linhas. O total só é calculado com
+?include_total=true e fica em cache até o próximo commit nos modelos.
+
+Sem ?cursor= as rotas continuam com page/per_page.
+"""
+
+from datetime import date, datetime
+
+from flask import current_app, request
+from itsdangerous import URLSafeSerializer, BadSignature
+from sqlalchemy import literal, tuple_
+
+from src.models import Student, MemberStatus, Event
+from src.utils.cache import TTLCache, invalidate_on_commit
+
+# Limite de itens por página no modo cursor
+MAX_PER_PAGE = 500
+
+# Parâmetros que não mudam o conjunto de linhas (fora da chave do total)
+_IGNORED_ARGS = {'cursor', 'page', 'per_page', 'include_total', 'fields', 'sort_order', 'token'}
+
+# Totais das listagens, limpos a cada commit em Student/MemberStatus/Event
+count_cache = TTLCache(ttl=300)
+invalidate_on_commit(count_cache, Student, MemberStatus, Event)
+
+
+def cursor_requested():
+    """A requisição usa paginação por cursor (?cursor=, vazio na primeira página)"""
+    return 'cursor' in request.args
+
+
+def _serializer():
+    # Um salt por rota: o cursor de uma listagem não vale em outra
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt=f'list-cursor:{request.path}')
+
+
+def _dump(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _load(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+    return value
+
+
+def encode_cursor(values):
+    """Cursor opaco para os valores de ordenação da última linha"""
+    return _serializer().dumps([_dump(value) for value in values])
+
+
+def decode_cursor(token, size):
+    """
+    Valores de ordenação gravados no cursor
+
+    Raises:
+        ValueError: Cursor inválido ou de outra listagem
+    """
+    try:
+        values = _serializer().loads(token)
+    except BadSignature:
+        raise ValueError('Cursor inválido')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Cursor inválido')
+    return [_load(value) for value in values]
+
+
+def keyset_page(query, keys, per_page, descending=False, entity=False):
+    """
+    Uma página da consulta ordenada por keys, a partir de ?cursor=
+
+    Args:
+        query: Consulta já filtrada (a ordenação existente é substituída)
+        keys: Colunas de ordenação, terminando no id como desempate
+        per_page: Itens por página (limitado a MAX_PER_PAGE)
+        descending: Ordem decrescente em todas as chaves
+        entity: A consulta retorna objetos ORM (True) ou tuplas de colunas
+
+    Returns:
+        Tupla (itens, paginação) com per_page, next_cursor (None na última
+        página), has_next e, se pedido, total
+
+    Raises:
+        ValueError: Cursor inválido
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    token = request.args.get('cursor')
+    values = decode_cursor(token, len(keys)) if token else None
+
+    pagination = {}
+    total = cached_total(query)
+    if total is not None:
+        pagination['total'] = total
+
+    if values is not None:
+        # Valores com o tipo da coluna (datetime gravado no mesmo formato do banco)
+        values = [literal(value, key.type) for key, value in zip(keys, values)]
+        after = tuple_(*keys) < tuple_(*values) if descending else tuple_(*keys) > tuple_(*values)
+        query = query.filter(after)
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    rows = query.order_by(None).order_by(*order).add_columns(*keys).limit(per_page + 1).all()
+
+    size = len(keys)
+    next_cursor = encode_cursor(rows[per_page - 1][-size:]) if len(rows) > per_page else None
+    rows = rows[:per_page]
+    items = [row[0] for row in rows] if entity else [tuple(row[:-size]) for row in rows]
+
+    pagination.update({'per_page': per_page, 'next_cursor': next_cursor, 'has_next': next_cursor is not None})
+    return items, pagination
+
+
+def cached_total(query):
+    """
+    COUNT da consulta em cache por rota, usuário e filtros, ou None se
+    ?include_total=true não foi pedido
+    """
+    if request.args.get('include_total', 'false').lower() != 'true':
+        return None
+    filters = tuple(sorted(
+        (name, value) for name, value in request.args.items(multi=True) if name not in _IGNORED_ARGS
+    ))
+    key = (request.path, getattr(request, 'current_user_id', None), filters)
+    return count_cache.get_or_set(key, lambda: query.order_by(None).count())
@@ -0,0 +1,238 @@
+"""
+Motor de recorrência de eventos
+Sistema Ki Aikido
+
+Calcula as datas de uma série recorrente em forma fechada: cada ocorrência
+é obtida diretamente a partir do seu índice na série, então o custo é
+proporcional ao número de ocorrências devolvidas e não ao número de dias
+percorridos no calendário.
+"""
+
+from datetime import timedelta
+import calendar
+
+# Limites históricos usados na materialização de ocorrências
+DEFAULT_MAX_OCCURRENCES = 100
+DEFAULT_HORIZON = timedelta(days=365)
+
+# Padrões suportados (Event.recurrence_pattern)
+PATTERNS = ('daily', 'weekly', 'monthly', 'yearly')
+
+# O calendário gregoriano se repete a cada 400 anos
+_GREGORIAN_CYCLE_MONTHS = 400 * 12
+_ONE_WEEK = timedelta(weeks=1)
+
+
+def parse_weekdays(value):
+    """
+    Converte o campo recurrence_days ("1,3,5") em lista de dias da semana
+
+    Args:
+        value: String separada por vírgulas, lista de inteiros ou None
+
+    Returns:
+        Lista de inteiros (0=segunda ... 6=domingo, como datetime.weekday())
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [int(part) for part in value.split(',') if part.strip()]
+    return [int(part) for part in value]
+
+
+class RecurrenceRule:
+    """
+    Regra de recorrência de uma série de eventos
+
+    Reproduz exatamente as datas do antigo laço dia a dia de
+    generate_recurring_occurrences:
+    - daily: a cada `interval` dias
+    - weekly sem dias: a cada `interval` semanas
+    - weekly com dias: toda semana nos dias informados (o intervalo é ignorado)
+    - monthly: mesmo dia do mês a cada `interval` meses; a série termina no
+      primeiro mês que não possui esse dia (ex: dia 31 em um mês de 30 dias)
+    - yearly: mesmo dia e mês a cada `interval` anos; uma série iniciada em
+      29/02 termina no primeiro ano não bissexto
+    """
+
+    def __init__(self, dtstart, pattern, interval=1, weekdays=None, until=None, count=None):
+        self.dtstart = dtstart
+        self.pattern = pattern
+        self.interval = max(int(interval or 1), 1)
+        self.until = until
+        self.count = count if count else None
+
+        # Recorrência semanal com dias específicos
+        self.by_weekday = pattern == 'weekly' and bool(weekdays)
+        self.weekdays = sorted({d for d in weekdays if 0 <= d <= 6}) if self.by_weekday else []
+        self._week_base = dtstart - timedelta(days=dtstart.weekday())
+        self._week_skip = len([d for d in self.weekdays if d < dtstart.weekday()])
+
+        self._stop_index = self._compute_stop_index()
+
+    @classmethod
+    def from_event(cls, event):
+        """Cria a regra a partir dos campos de recorrência de um Event"""
+        return cls(
+            dtstart=event.start_datetime,
+            pattern=event.recurrence_pattern,
+            interval=event.recurrence_interval,
+            weekdays=parse_weekdays(event.recurrence_days),
+            until=event.recurrence_end_date,
+            count=event.recurrence_count
+        )
+
+    def _compute_stop_index(self):
+        """Retorna o índice (exclusivo) em que a série termina, ou None se infinita"""
+        natural = None
+
+        if self.pattern not in PATTERNS or (self.by_weekday and not self.weekdays):
+            natural = 0
+        elif self.pattern == 'monthly' and self.dtstart.day > 28:
+            natural = self._first_missing_index(
+                lambda k: self._month_offset(k),
+                _GREGORIAN_CYCLE_MONTHS // self.interval + 1
+            )
+        elif self.pattern == 'yearly' and (self.dtstart.month, self.dtstart.day) == (2, 29):
+            natural = self._first_missing_index(
+                lambda k: (self.dtstart.year + k * self.interval, 2),
+                400 // self.interval + 1
+            )
+
+        if self.count is None:
+            return natural
+        if natural is None:
+            return self.count
+        return min(natural, self.count)
+
+    @property
+    def max_count(self):
+        """Número máximo de ocorrências (count ou fim natural da série); None se ilimitada"""
+        return self._stop_index
+
+    def _first_missing_index(self, year_month_at, max_steps):
+        """Primeiro índice cujo mês não contém o dia inicial da série"""
+        for k in range(1, max_steps + 1):
+            year, month = year_month_at(k)
+            if year > 9999:
+                return k
+            if calendar.monthrange(year, month)[1] < self.dtstart.day:
+                return k
+        return None
+
+    def _month_offset(self, k):
+        """Ano e mês da k-ésima ocorrência mensal"""
+        total = self.dtstart.month - 1 + k * self.interval
+        return self.dtstart.year + total // 12, total % 12 + 1
+
+    def _weekday_slot(self, g):
+        """Data da posição g na grade semanal (contando a partir da semana inicial)"""
+        weeks, position = divmod(g, len(self.weekdays))
+        return self._week_base + timedelta(days=7 * weeks + self.weekdays[position])
+
+    def date_at(self, k):
+        """Retorna a data da k-ésima ocorrência (0 = primeira)"""
+        if self.pattern == 'daily':
+            return self.dtstart + timedelta(days=k * self.interval)
+        if self.pattern == 'weekly':
+            if self.by_weekday:
+                return self._weekday_slot(k + self._week_skip)
+            return self.dtstart + timedelta(weeks=k * self.interval)
+        if self.pattern == 'monthly':
+            year, month = self._month_offset(k)
+            return self.dtstart.replace(year=year, month=month)
+        if self.pattern == 'yearly':
+            return self.dtstart.replace(year=self.dtstart.year + k * self.interval)
+        return None
+
+    def index_at_or_after(self, moment):
+        """Retorna o menor índice cuja data é >= moment"""
+        if moment <= self.dtstart:
+            return 0
+
+        if self.pattern in ('daily', 'weekly') and not self.by_weekday:
+            step = timedelta(days=self.interval) if self.pattern == 'daily' else timedelta(weeks=self.interval)
+            return -((self.dtstart - moment) // step)
+
+        if self.by_weekday:
+            g = ((moment - self._week_base) // _ONE_WEEK) * len(self.weekdays)
+            while self._weekday_slot(g) < moment:
+                g += 1
+            return max(g - self._week_skip, 0)
+
+        # monthly/yearly: estimativa por baixo e ajuste fino (no máximo poucos passos)
+        if self.pattern == 'monthly':
+            months = (moment.year - self.dtstart.year) * 12 + moment.month - self.dtstart.month
+            k = max(months // self.interval - 1, 0)
+        else:
+            k = max((moment.year - self.dtstart.year) // self.interval - 1, 0)
+
+        while self._stop_index is None or k < self._stop_index:
+            if self.date_at(k) >= moment:
+                return k
+            k += 1
+        return k
+
+    def _dates_from(self, k):
+        """Gera as datas a partir do índice k, avançando incrementalmente"""
+        if self.by_weekday:
+            weeks, position = divmod(k + self._week_skip, len(self.weekdays))
+            week_start = self._week_base + timedelta(weeks=weeks)
+            offsets = [timedelta(days=d) for d in self.weekdays]
+            while True:
+                for offset in offsets[position:]:
+                    yield week_start + offset
+                position = 0
+                week_start += _ONE_WEEK
+        elif self.pattern in ('daily', 'weekly'):
+            step = timedelta(days=self.interval) if self.pattern == 'daily' else timedelta(weeks=self.interval)
+            current = self.date_at(k)
+            while True:
+                yield current
+                current += step
+        else:
+            while True:
+                yield self.date_at(k)
+                k += 1
+
+    def iter_dates(self, start=None, end=None, limit=None):
+        """
+        Itera as datas da série em ordem
+
+        Args:
+            start: Primeira data aceita (inclusive); None = início da série
+            end: Última data aceita (inclusive); None = sem limite além da regra
+            limit: Número máximo de datas devolvidas
+
+        Returns:
+            Gerador de datetimes
+        """
+        if self._stop_index == 0:
+            return
+
+        k = 0 if start is None else self.index_at_or_after(start)
+
+        # Quantidade máxima de datas restantes (fim natural, count e limit)
+        remaining = None if self._stop_index is None else self._stop_index - k
+        if limit is not None:
+            remaining = limit if remaining is None else min(remaining, limit)
+
+        bounds = [value for value in (self.until, end) if value is not None]
+        bound = min(bounds) if bounds else None
+
+        dates = self._dates_from(k)
+        while remaining is None or remaining > 0:
+            current = next(dates)
+            if bound is not None and current > bound:
+                return
+            yield current
+            if remaining is not None:
+                remaining -= 1
+
+    def next_dates(self, n, after=None):
+        """Retorna as próximas n datas a partir de `after` (inclusive)"""
+        return list(self.iter_dates(start=after, limit=n))
+
+    def between(self, start, end, limit=None):
+        """Retorna todas as datas da série dentro da janela [start, end]"""
+        return list(self.iter_dates(start=start, end=end, limit=limit))
@@ -0,0 +1,164 @@
+"""
+Índice de disparo dos avisos de eventos
+Sistema Ki Aikido
+
+Cada aviso ativo gera um registro em event_reminder_fires por ocorrência do
+evento, com o início da ocorrência (event_start) e o momento em que o aviso
+passa a ser exibido (fire_at = event_start - days_before). Assim a consulta
+de avisos ativos é uma varredura de intervalo no índice, sem calcular nada
+por requisição, e o ticker sabe exatamente quando o próximo aviso dispara.
+"""
+
+from datetime import datetime, timedelta
+import threading
+
+from flask import current_app
+from sqlalchemy.orm import joinedload
+
+from src.models import db, Event, EventReminder, EventReminderFire, EventOccurrence
+from src.utils.recurrence import RecurrenceRule
+from src.utils.event_bus import change_bus
+
+
+def fire_window(now=None):
+    """Intervalo de inícios de ocorrência cobertos pelo índice"""
+    today = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today, today + timedelta(days=int(current_app.config['EVENT_MATERIALIZE_HORIZON_DAYS']))
+
+
+def refresh_reminder_fires(events, now=None):
+    """
+    Recalcula o índice de disparo dos avisos dos eventos informados
+
+    Deve ser chamado antes do commit sempre que o evento, seus avisos ou
+    o status de uma de suas ocorrências mudarem.
+
+    Args:
+        events: Lista de eventos (Event) a recalcular
+        now: Momento de referência (padrão: agora)
+
+    Returns:
+        Número de registros gravados
+    """
+    if not events:
+        return 0
+
+    event_ids = [event.id for event in events]
+    window_start, window_end = fire_window(now)
+
+    db.session.execute(db.delete(EventReminderFire).where(EventReminderFire.event_id.in_(event_ids)))
+
+    reminders = {}
+    for reminder in EventReminder.query.filter(
+        EventReminder.event_id.in_(event_ids),
+        EventReminder.is_active == True
+    ):
+        reminders.setdefault(reminder.event_id, []).append(reminder)
+
+    # Ocorrências suspensas ou canceladas não disparam avisos
+    skipped = {
+        (event_id, occurrence_date.date())
+        for event_id, occurrence_date in db.session.query(
+            EventOccurrence.event_id, EventOccurrence.occurrence_date
+        ).filter(
+            EventOccurrence.event_id.in_(event_ids),
+            EventOccurrence.status != 'active',
+            EventOccurrence.occurrence_date >= window_start
+        )
+    }
+
+    rows = []
+    for event in events:
+        if event.status != 'active' or event.id not in reminders:
+            continue
+
+        if event.is_recurring:
+            starts = [
+                start for start in RecurrenceRule.from_event(event).between(window_start, window_end)
+                if (event.id, start.date()) not in skipped
+            ]
+        else:
+            starts = [event.start_datetime] if event.start_datetime >= window_start else []
+
+        for start in starts:
+            for reminder in reminders[event.id]:
+                rows.append({
+                    'reminder_id': reminder.id,
+                    'event_id': event.id,
+                    'dojo_id': event.dojo_id,
+                    'event_start': start,
+                    'fire_at': start - timedelta(days=reminder.days_before)
+                })
+
+    if rows:
+        db.session.execute(db.insert(EventReminderFire), rows)
+    return len(rows)
+
+
+def refresh_recurring_reminder_fires(now=None):
+    """Avança a janela do índice das séries recorrentes com avisos (usado pelo job periódico)"""
+    events = Event.query.filter(
+        Event.is_recurring == True,
+        Event.id.in_(db.session.query(EventReminder.event_id).filter(EventReminder.is_active == True))
+    ).all()
+    return refresh_reminder_fires(events, now)
+
+
+def due_reminder_fires(after, until):
+    """Disparos que passaram a valer no intervalo (after, until], para eventos dos próximos 7 dias"""
+    today = until.replace(hour=0, minute=0, second=0, microsecond=0)
+    return EventReminderFire.query.options(
+        joinedload(EventReminderFire.reminder),
+        joinedload(EventReminderFire.event)
+    ).filter(
+        EventReminderFire.event_start >= today,
+        EventReminderFire.event_start <= today + timedelta(days=7),
+        EventReminderFire.fire_at > after,
+        EventReminderFire.fire_at <= until
+    ).order_by(EventReminderFire.fire_at).all()
+
+
+def start_reminder_ticker(app, max_sleep=3600):
+    """
+    Publica no change_bus os avisos no momento em que são ativados
+
+    A thread dorme até o próximo fire_at (uma consulta por ativação, não por
+    cliente) e é acordada quando algum evento muda, pois o índice pode ter
+    ganho um disparo mais próximo.
+
+    Returns:
+        A thread iniciada
+    """
+    wake = threading.Event()
+    change_bus.add_listener(lambda kind, data, dojo_id: kind == 'calendar' and wake.set())
+
+    def loop():
+        last_check = datetime.utcnow()
+        while True:
+            sleep = max_sleep
+            with app.app_context():
+                try:
+                    now = datetime.utcnow()
+                    if change_bus.subscriber_count:
+                        for fire in due_reminder_fires(last_check, now):
+                            reminder = fire.reminder.to_dict()
+                            reminder['event'] = fire.event.to_dict()
+                            reminder['occurrence_date'] = fire.event_start.isoformat()
+                            change_bus.publish('reminder', reminder, dojo_id=fire.dojo_id)
+                    last_check = now
+                    
+                    next_fire = db.session.query(db.func.min(EventReminderFire.fire_at)).filter(
+                        EventReminderFire.fire_at > now
+                    ).scalar()
+                    if next_fire:
+                        sleep = min(max((next_fire - now).total_seconds(), 1), max_sleep)
+                except Exception as e:
+                    print(f"Erro ao verificar avisos: {e}")
+                finally:
+                    db.session.remove()
+            wake.wait(timeout=sleep)
+            wake.clear()
+
+    thread = threading.Thread(target=loop, name='reminder-ticker', daemon=True)
+    thread.start()
+    return thread
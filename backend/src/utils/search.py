@@ -0,0 +1,142 @@
+"""
+Busca textual com índices FTS5 do SQLite
+Sistema Ki Aikido
+
+As tabelas FTS5 usam o tokenizador unicode61 com remove_diacritics 2, então
+"joao" encontra "João" e maiúsculas/minúsculas não importam. Cada termo da
+busca vira um prefixo ("jo" encontra "João", "Joana"), todos obrigatórios,
+e os resultados podem ser ordenados pela relevância (bm25).
+
+As tabelas e os triggers que as mantêm sincronizadas são criados pelas
+migrações; enquanto não existirem (ex: SQLite sem FTS5, AUTO_MIGRATE
+desligado) as rotas continuam com a busca por ilike.
+"""
+
+import re
+import sqlite3
+
+from sqlalchemy import column, func, literal_column, select, table
+
+from src.models import db
+
+# Tokenizador das tabelas de busca (ignora acentos, inclusive em bancos antigos)
+FTS_TOKENIZER = 'unicode61 remove_diacritics 2'
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def fts5_supported():
+    """Indica se o SQLite em uso foi compilado com FTS5"""
+    options = db.session.execute(db.text('PRAGMA compile_options')).scalars()
+    return any(option == 'ENABLE_FTS5' for option in options)
+
+
+def fts_query(text):
+    """
+    Converte o texto digitado em uma expressão MATCH de prefixos
+
+    Returns:
+        Expressão FTS5 (ex: '"joao"* "silva"*'), ou None se não houver termos
+    """
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+class SearchIndex:
+    """
+    Tabela FTS5 cujo rowid é o id da linha indexada
+
+    Args:
+        name: Nome da tabela FTS5
+        columns: Colunas indexadas, na ordem da tabela
+        weights: Peso de cada coluna no bm25 (maior = mais relevante)
+    """
+
+    def __init__(self, name, columns, weights):
+        self.name = name
+        self.columns = list(columns)
+        self.weights = list(weights)
+        self._available = False
+
+    def available(self):
+        """A tabela existe no banco atual (resultado positivo fica em cache)"""
+        if not self._available:
+            self._available = db.session.execute(
+                db.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': self.name}
+            ).first() is not None
+        return self._available
+
+    def create_statement(self):
+        """CREATE VIRTUAL TABLE da tabela de busca"""
+        return (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.name} "
+            f"USING fts5({', '.join(self.columns)}, tokenize='{FTS_TOKENIZER}')"
+        )
+
+    def _expression(self, text, columns):
+        expression = fts_query(text)
+        if expression is not None and columns:
+            expression = f"{{{' '.join(columns)}}} : ({expression})"
+        return expression
+
+    def match(self, text, columns=None):
+        """
+        CTE (rowid, rank) das linhas que contêm todos os prefixos
+
+        Faça JOIN de rowid com o id do modelo e ordene por rank (menor =
+        mais relevante). A CTE é MATERIALIZED: a busca roda uma vez e só as
+        linhas encontradas são lidas da tabela do modelo. Sem isso o SQLite
+        pode preferir o índice de outro filtro (ex: dojo_id) e repetir a
+        busca FTS para cada linha, como acontece no COUNT da paginação.
+
+        Args:
+            text: Texto digitado pelo usuário
+            columns: Restringe a busca a estas colunas (padrão: todas)
+
+        Returns:
+            CTE, ou None se o texto não tiver termos pesquisáveis
+        """
+        expression = self._expression(text, columns)
+        if expression is None:
+            return None
+        fts = table(self.name, column('rowid'))
+        target = literal_column(self.name)
+        matches = select(
+            fts.c.rowid.label('rowid'),
+            func.bm25(target, *self.weights).label('rank')
+        ).select_from(fts).where(target.op('MATCH')(expression)).cte(f'{self.name}_match')
+        if sqlite3.sqlite_version_info >= (3, 35):  # AS MATERIALIZED
+            matches = matches.prefix_with('MATERIALIZED')
+        return matches
+
+    def matching_ids(self, text, columns=None):
+        """
+        SELECT dos rowids que contêm todos os prefixos, para usar em
+        Model.id.in_() quando não é preciso ordenar por relevância
+
+        Returns:
+            Consulta, ou None se o texto não tiver termos pesquisáveis
+        """
+        expression = self._expression(text, columns)
+        if expression is None:
+            return None
+        fts = table(self.name, column('rowid'))
+        return select(fts.c.rowid).where(literal_column(self.name).op('MATCH')(expression))
+
+
+# Alunos e membros: o número de registro do membro fica na linha do aluno
+STUDENT_SEARCH = SearchIndex(
+    'student_search',
+    columns=['name', 'email', 'registration_number', 'registered_number'],
+    weights=[10.0, 1.0, 5.0, 5.0]
+)
+
+# Eventos (título, descrição e local); rowid = events.id
+EVENT_SEARCH = SearchIndex(
+    'event_search',
+    columns=['title', 'description', 'location'],
+    weights=[10.0, 1.0, 3.0]
+)
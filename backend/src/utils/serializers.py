@@ -0,0 +1,195 @@
+"""
+Serialização rápida das listagens
+Sistema Ki Aikido
+
+As listagens mais pesadas selecionam apenas tuplas de colunas (sem
+instanciar objetos ORM nem carregar relacionamentos) e convertem cada linha
+com um serializador montado uma única vez por modelo. Datas seguem como
+datetime/date até o encoder: com orjson (requirements.txt) a conversão é
+feita em C; se ele não estiver instalado, usa-se o json da biblioteca
+padrão com isoformat().
+
+O caminho é opcional, habilitado por LIST_ROW_SERIALIZERS (desligado por
+padrão), e gera as mesmas chaves de to_dict()/to_summary().
+"""
+
+import json
+from datetime import date, datetime
+
+from flask import Response, current_app
+from sqlalchemy.orm import aliased
+
+try:
+    import orjson
+except ImportError:  # sem orjson, json da biblioteca padrão
+    orjson = None
+
+from src.models import Dojo, Student, MemberStatus, Event, DocumentAttachment, User
+from src.utils.fields import wants
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Tipo não serializável: {type(value).__name__}')
+
+
+def dumps(payload):
+    """Serializa em JSON (bytes), com chaves ordenadas como o jsonify"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        payload, default=_default, sort_keys=True, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def json_response(payload, status=200):
+    """Equivalente a jsonify() usando o encoder mais rápido disponível"""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def row_serializers_enabled():
+    return bool(current_app.config.get('LIST_ROW_SERIALIZERS'))
+
+
+class RowSerializer:
+    """
+    Serializador de linhas pré-compilado
+
+    Args:
+        columns: Pares (chave, coluna) na ordem de saída; chaves iniciadas
+            por '_' são auxiliares e não aparecem na resposta
+        computed: Pares (chave, (dependências, função(valores))) calculados
+            a partir das colunas selecionadas
+        joins: Triplas (entidade, condição, chaves) unidas por OUTER JOIN
+            apenas quando alguma das chaves for selecionada
+    """
+
+    def __init__(self, columns, computed=(), joins=()):
+        self.columns = dict(columns)
+        self.computed = dict(computed)
+        self.joins = list(joins)
+
+    def _keys(self, fields):
+        """Colunas a selecionar para os campos pedidos"""
+        needed = {key for key in self.columns if not key.startswith('_') and wants(fields, key)}
+        for key, (dependencies, _) in self.computed.items():
+            if wants(fields, key):
+                needed.update(dependencies)
+        return [key for key in self.columns if key in needed]
+
+    def select(self, query, fields=None):
+        """Troca as entidades da consulta pelas colunas necessárias (linhas em vez de objetos)"""
+        keys = self._keys(fields)
+        for entity, condition, join_keys in self.joins:
+            if any(key in keys for key in join_keys):
+                query = query.outerjoin(entity, condition)
+        return query.with_entities(*[self.columns[key].label(key) for key in keys])
+
+    def serialize(self, rows, fields=None):
+        """Converte as linhas retornadas por select() em dicionários"""
+        keys = self._keys(fields)
+        output = [key for key in keys if not key.startswith('_') and wants(fields, key)]
+        computed = [(key, function) for key, (_, function) in self.computed.items() if wants(fields, key)]
+
+        items = []
+        for row in rows:
+            values = dict(zip(keys, row))
+            item = {key: values[key] for key in output}
+            for key, function in computed:
+                item[key] = function(values)
+            items.append(item)
+        return items
+
+
+def _display(mapping, key):
+    return (key,), lambda values: mapping.get(values[key], values[key])
+
+
+def _current_ranks(values):
+    return {
+        discipline: {'rank_name': values['_' + name_column], 'rank_level': values['_' + level_column]}
+        for discipline, (name_column, level_column) in MemberStatus.RANK_COLUMNS.items()
+        if values['_' + name_column]
+    }
+
+
+# Student.to_dict()
+STUDENT_ROWS = RowSerializer(
+    columns=[
+        ('id', Student.id),
+        ('registration_number', Student.registration_number),
+        ('name', Student.name),
+        ('email', Student.email),
+        ('phone', Student.phone),
+        ('birth_date', Student.birth_date),
+        ('address', Student.address),
+        ('dojo_id', Student.dojo_id),
+        ('dojo_name', Dojo.name),
+        ('registration_date', Student.registration_date),
+        ('started_practicing_year', Student.started_practicing_year),
+        ('status', MemberStatus.current_status),
+        ('_member_status_id', MemberStatus.id),
+        ('notes', Student.notes),
+        ('created_at', Student.created_at),
+        ('updated_at', Student.updated_at)
+    ],
+    computed=[
+        ('has_member_status', (('_member_status_id',), lambda values: values['_member_status_id'] is not None))
+    ],
+    joins=[
+        (Dojo, Student.dojo_id == Dojo.id, ('dojo_name',)),
+        (MemberStatus, MemberStatus.student_id == Student.id, ('status', '_member_status_id'))
+    ]
+)
+
+# MemberStatus.to_summary() (a consulta da listagem já faz JOIN com Student)
+_RANK_COLUMN_NAMES = [name for columns in MemberStatus.RANK_COLUMNS.values() for name in columns]
+
+MEMBER_STATUS_ROWS = RowSerializer(
+    columns=[
+        ('id', MemberStatus.id),
+        ('student_id', MemberStatus.student_id),
+        ('student_name', Student.name),
+        ('registered_number', MemberStatus.registered_number),
+        ('membership_date', MemberStatus.membership_date),
+        ('member_type', MemberStatus.member_type),
+        ('current_status', MemberStatus.current_status),
+        *[('_' + name, getattr(MemberStatus, name)) for name in _RANK_COLUMN_NAMES]
+    ],
+    computed=[
+        ('member_type_display', _display(MemberStatus.MEMBER_TYPES, 'member_type')),
+        ('current_status_display', _display(MemberStatus.STATUS_TYPES, 'current_status')),
+        ('current_graduations', (['_' + name for name in _RANK_COLUMN_NAMES], _current_ranks))
+    ]
+)
+
+# Event.to_dict()
+EVENT_ROWS = RowSerializer(
+    columns=[
+        *[(column.key, getattr(Event, column.key)) for column in Event.__table__.columns],
+        ('dojo_name', Dojo.name)
+    ],
+    joins=[
+        (Dojo, Event.dojo_id == Dojo.id, ('dojo_name',))
+    ]
+)
+
+# DocumentAttachment.to_dict()
+_uploader = aliased(User)
+_verifier = aliased(User)
+
+DOCUMENT_ROWS = RowSerializer(
+    columns=[
+        *[(column.key, getattr(DocumentAttachment, column.key)) for column in DocumentAttachment.__table__.columns],
+        ('uploaded_by_name', _uploader.name),
+        ('verified_by_name', _verifier.name)
+    ],
+    computed=[
+        ('document_type_display', _display(DocumentAttachment.DOCUMENT_TYPES, 'document_type'))
+    ],
+    joins=[
+        (_uploader, DocumentAttachment.uploaded_by_user_id == _uploader.id, ('uploaded_by_name',)),
+        (_verifier, DocumentAttachment.verified_by_user_id == _verifier.id, ('verified_by_name',))
+    ]
+)
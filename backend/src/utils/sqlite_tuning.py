@@ -0,0 +1,79 @@
+"""
+Perfil de PRAGMAs do SQLite aplicado a cada conexão
+Sistema Ki Aikido
+
+Com as configurações padrão do SQLite (journal de rollback, sem chaves
+estrangeiras, cache pequeno) uma escrita bloqueia todas as leituras e
+escritas concorrentes se enfileiram. O perfil de produção usa WAL (leitores
+não bloqueiam o escritor nem são bloqueados por ele), synchronous=NORMAL
+(seguro com WAL, sem fsync a cada commit), espera por lock em vez de erro
+imediato, cache e mmap maiores e temporários em memória.
+
+Os valores vêm das configurações SQLITE_* do app; SQLITE_TUNING=false
+desliga o perfil.
+"""
+
+from sqlalchemy import event
+
+# PRAGMA -> chave de configuração, na ordem de aplicação
+SQLITE_PRAGMAS = [
+    ('journal_mode', 'SQLITE_JOURNAL_MODE'),
+    ('synchronous', 'SQLITE_SYNCHRONOUS'),
+    ('busy_timeout', 'SQLITE_BUSY_TIMEOUT'),
+    ('cache_size', 'SQLITE_CACHE_SIZE'),
+    ('mmap_size', 'SQLITE_MMAP_SIZE'),
+    ('temp_store', 'SQLITE_TEMP_STORE'),
+    ('foreign_keys', 'SQLITE_FOREIGN_KEYS'),
+]
+
+# Valores numéricos retornados pelo SQLite para os PRAGMAs de enumeração
+_ENUM_VALUES = {
+    'synchronous': {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'},
+    'temp_store': {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'},
+    'foreign_keys': {0: 'OFF', 1: 'ON'},
+}
+
+
+def sqlite_profile(config):
+    """
+    PRAGMAs configurados
+
+    Returns:
+        Dicionário {pragma: valor}; vazio se SQLITE_TUNING estiver desligado
+    """
+    if not config.get('SQLITE_TUNING'):
+        return {}
+    return {pragma: config[key] for pragma, key in SQLITE_PRAGMAS if config.get(key) is not None}
+
+
+def apply_sqlite_profile(engine, profile):
+    """
+    Registra a aplicação dos PRAGMAs em cada nova conexão do engine
+
+    Não faz nada para bancos que não sejam SQLite.
+    """
+    if engine.dialect.name != 'sqlite' or not profile:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in profile.items():
+                cursor.execute(f'PRAGMA {pragma} = {value}')
+        finally:
+            cursor.close()
+
+
+def read_pragmas(connection):
+    """
+    Valores efetivos dos PRAGMAs do perfil em uma conexão
+
+    Returns:
+        Dicionário {pragma: valor} com enumerações por nome (ex: 'NORMAL')
+    """
+    values = {}
+    for pragma, _ in SQLITE_PRAGMAS:
+        value = connection.exec_driver_sql(f'PRAGMA {pragma}').scalar()
+        values[pragma] = _ENUM_VALUES.get(pragma, {}).get(value, value)
+    return values
@@ -0,0 +1,79 @@
+"""
+Fixtures dos testes da API
+Sistema Ki Aikido
+
+Os testes rodam contra um banco SQLite temporário (DATABASE_PATH), criado
+e populado com os dados de exemplo de init_database(). Rode a partir de
+backend/: python -m pytest tests
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import event
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Antes de importar a aplicação: banco temporário (as threads de fundo só
+# sobem com main.py executado diretamente)
+_DATABASE_DIR = tempfile.mkdtemp(prefix='ki-aikido-tests-')
+os.environ['DATABASE_PATH'] = os.path.join(_DATABASE_DIR, 'app.db')
+atexit.register(shutil.rmtree, _DATABASE_DIR, ignore_errors=True)
+
+from src.main import app as flask_app, init_database  # noqa: E402
+from src.models import db  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app():
+    flask_app.config['TESTING'] = True
+    init_database()
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_headers(client):
+    response = client.post('/api/auth/login', json={'email': 'admin@kiaikido.com', 'password': '123456'})
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+class StatementCounter:
+    """Conta os comandos SQL executados (evento before_cursor_execute do engine)"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _count(self, connection, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_statements(app):
+    """Uso: with count_statements() as counter: ...; counter.count"""
+    def factory():
+        with app.app_context():
+            engine = db.engine
+        return StatementCounter(engine)
+    return factory
@@ -0,0 +1,112 @@
+"""Testes de GET /events (quantidade de consultas com ocorrências expandidas)"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def create_recurring_events(client, headers, count):
+    start = (datetime.utcnow() + timedelta(days=1)).replace(hour=19, minute=0, second=0, microsecond=0)
+    for i in range(count):
+        response = client.post('/api/events', headers=headers, json={
+            'title': f'Aula recorrente {i}',
+            'category': 'aula_regular',
+            'event_type': 'admin',
+            'start_datetime': start.isoformat(),
+            'end_datetime': (start + timedelta(hours=1)).isoformat(),
+            'is_recurring': True,
+            'recurrence_pattern': 'daily'
+        })
+        assert response.status_code == 201, response.get_json()
+
+
+@pytest.mark.parametrize('mode', ['materialized', 'virtual'])
+def test_expanded_events_query_count_is_constant(app, client, admin_headers, count_statements, monkeypatch, mode):
+    """As ocorrências de todos os eventos da página vêm de uma única consulta"""
+    monkeypatch.setitem(app.config, 'EVENT_OCCURRENCE_MODE', mode)
+    url = '/api/events?expand_occurrences=true&per_page=500'
+
+    create_recurring_events(client, admin_headers, 2)
+    with count_statements() as few:
+        response = client.get(url, headers=admin_headers)
+    assert response.status_code == 200
+
+    create_recurring_events(client, admin_headers, 10)
+    with count_statements() as many:
+        response = client.get(url, headers=admin_headers)
+    assert response.status_code == 200
+
+    recurring = [event for event in response.get_json()['events'] if event['title'].startswith('Aula recorrente')]
+    assert len(recurring) >= 12
+    assert all(event['upcoming_occurrences'] for event in recurring)
+    assert many.count == few.count
+
+
+def test_bounded_series_materialized_until_end_date(app, client, admin_headers, monkeypatch):
+    """Séries com data final são gravadas até o fim; só as abertas usam a janela curta"""
+    from src.models import EventOccurrence
+    from src.utils.materializer import run_materializer
+
+    monkeypatch.setitem(app.config, 'EVENT_OCCURRENCE_MODE', 'materialized')
+    start = (datetime.utcnow() + timedelta(days=1)).replace(hour=19, minute=0, second=0, microsecond=0)
+    end_date = start + timedelta(days=270)
+
+    def create(title, **recurrence):
+        response = client.post('/api/events', headers=admin_headers, json={
+            'title': title,
+            'category': 'aula_regular',
+            'event_type': 'admin',
+            'start_datetime': start.isoformat(),
+            'end_datetime': (start + timedelta(hours=1)).isoformat(),
+            'is_recurring': True,
+            'recurrence_pattern': 'weekly',
+            **recurrence
+        })
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['event']['id']
+
+    bounded_id = create('Aula com data final', recurrence_end_date=end_date.isoformat())
+    open_id = create('Aula sem data final')
+
+    def last_occurrence(event_id):
+        with app.app_context():
+            return EventOccurrence.query.filter_by(event_id=event_id).order_by(
+                EventOccurrence.occurrence_date.desc()
+            ).first().occurrence_date
+
+    # Na escrita: a série com data final inteira, a aberta só a janela curta
+    assert last_occurrence(bounded_id) > end_date - timedelta(days=7)
+    write_window = timedelta(days=app.config['EVENT_WRITE_WINDOW_DAYS'])
+    assert last_occurrence(open_id) <= start + write_window
+
+    # O job estende apenas a série aberta, até o horizonte
+    with app.app_context():
+        run_materializer()
+    horizon = timedelta(days=app.config['EVENT_MATERIALIZE_HORIZON_DAYS'])
+    assert start + horizon - timedelta(days=7) < last_occurrence(open_id) <= start + horizon
+    assert last_occurrence(bounded_id) > end_date - timedelta(days=7)
+
+
+def test_ics_exports_only_suspended_or_cancelled_as_exdate(app, client, admin_headers):
+    """Ocorrências realizadas continuam no calendário; só suspensas/canceladas viram EXDATE"""
+    from src.models import Event, EventOccurrence
+    from src.utils.ics import render_event
+
+    create_recurring_events(client, admin_headers, 1)
+    with app.app_context():
+        event = Event.query.filter_by(title='Aula recorrente 0').first()
+        day = timedelta(days=1)
+        completed = EventOccurrence.virtual(event, event.start_datetime)
+        completed.status = 'completed'
+        renamed = EventOccurrence.virtual(event, event.start_datetime + day)
+        renamed.status = 'completed'
+        renamed.override_title = 'Aula com convidado'
+        cancelled = EventOccurrence.virtual(event, event.start_datetime + 2 * day)
+        cancelled.status = 'cancelled'
+
+        lines = render_event(event, [completed, renamed, cancelled]).splitlines()
+
+    assert sum(line.startswith('EXDATE') for line in lines) == 1
+    assert sum(line.startswith('RECURRENCE-ID') for line in lines) == 1
+    assert 'SUMMARY:Aula com convidado' in lines
+    assert lines.count('STATUS:CANCELLED') == 0
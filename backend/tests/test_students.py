@@ -0,0 +1,48 @@
+"""Testes de GET /students (quantidade de consultas por página)"""
+
+from datetime import date
+
+import pytest
+
+from src.models import db, Dojo, Student, MemberStatus
+
+
+@pytest.fixture(scope='module')
+def many_students(app):
+    """60 alunos distribuídos entre os dojos, metade com status de membro"""
+    with app.app_context():
+        dojo_ids = [dojo.id for dojo in Dojo.query.all()]
+        for i in range(60):
+            student = Student(
+                registration_number=f'QC-{i:03d}',
+                name=f'Aluno Consulta {i:03d}',
+                email=f'consulta{i}@example.com',
+                birth_date=date(1990, 1, 1),
+                address='Rua Teste',
+                dojo_id=dojo_ids[i % len(dojo_ids)]
+            )
+            db.session.add(student)
+            db.session.flush()
+            if i % 2:
+                db.session.add(MemberStatus(student_id=student.id, current_status='active'))
+        db.session.commit()
+
+
+@pytest.mark.parametrize('row_serializers', [False, True])
+def test_students_query_count_independent_of_page_size(app, client, admin_headers, count_statements,
+                                                       many_students, monkeypatch, row_serializers):
+    """Dojo e status de membro de todos os alunos da página vêm em consultas fixas (sem N+1)"""
+    monkeypatch.setitem(app.config, 'LIST_ROW_SERIALIZERS', row_serializers)
+
+    counts = {}
+    for per_page in (5, 50):
+        with count_statements() as counter:
+            response = client.get(f'/api/students?per_page={per_page}', headers=admin_headers)
+        assert response.status_code == 200
+        students = response.get_json()['students']
+        assert len(students) == per_page
+        assert any(student['has_member_status'] for student in students)
+        assert all(student['dojo_name'] for student in students)
+        counts[per_page] = counter.count
+
+    assert counts[5] == counts[50]
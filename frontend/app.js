@@ -261,6 +261,9 @@ async function logout() {
     }
     
     // Limpar dados
+    if (typeof disconnectCalendarStream === 'function') {
+        disconnectCalendarStream();
+    }
     authToken = null;
     currentUser = null;
     localStorage.removeItem('authToken');
@@ -1262,6 +1265,7 @@ async function openMemberModal(memberId = null) {
             
             document.getElementById('memberId').value = member.id;
             document.getElementById('memberStudentId').value = member.student_id;
+            ensureStudentOption(member.student_id, member.student_name);
             document.getElementById('memberStudentSelect').value = member.student_id;
             document.getElementById('memberStudentSelect').disabled = true;
             document.getElementById('memberRegisteredNumber').value = member.registered_number || '';
@@ -1359,6 +1363,7 @@ async function openMemberModalForStudent(studentId, studentName) {
         // Pré-seleciona o estudante
         const selectElement = document.getElementById('memberStudentSelect');
         if (selectElement) {
+            ensureStudentOption(studentId, studentName);
             selectElement.value = studentId;
         }
         
@@ -1386,21 +1391,9 @@ async function viewMemberDetails(memberId) {
     showLoading();
     
     try {
-        // Buscar dados completos do membro
-        console.log('Fetching member from API:', `/member-status/${memberId}`);
-        const memberResponse = await apiRequest(`/member-status/${memberId}`);
-        console.log('Member data received:', memberResponse);
-        const member = memberResponse; // Member já vem direto, não aninhado
-        
-        const studentResponse = await apiRequest(`/students/${member.student_id}`);
-        console.log('Student data for member received:', studentResponse);
-        const student = studentResponse.student || studentResponse; // Student vem aninhado em {student: {...}}
-        
-        const graduations = await apiRequest(`/member-status/${memberId}/graduations`);
-        console.log('Graduations received:', graduations);
-        
-        const qualifications = await apiRequest(`/member-status/${memberId}/qualifications`);
-        console.log('Qualifications received:', qualifications);
+        // Buscar dados completos do membro (status, cadastro, graduações e qualificações em uma requisição)
+        console.log('Fetching member profile from API:', `/member-status/${memberId}/profile`);
+        const { member, student, graduations, qualifications } = await apiRequest(`/member-status/${memberId}/profile`);
         
         console.log('Extracted objects:', { member, student, graduations, qualifications });
         
@@ -1423,14 +1416,7 @@ async function refreshMemberDetails(memberId) {
     
     try {
         // Buscar dados atualizados
-        const memberResponse = await apiRequest(`/member-status/${memberId}`);
-        const member = memberResponse;
-        
-        const studentResponse = await apiRequest(`/students/${member.student_id}`);
-        const student = studentResponse.student || studentResponse;
-        
-        const graduations = await apiRequest(`/member-status/${memberId}/graduations`);
-        const qualifications = await apiRequest(`/member-status/${memberId}/qualifications`);
+        const { member, student, graduations, qualifications } = await apiRequest(`/member-status/${memberId}/profile`);
         
         // Atualizar apenas o conteúdo do modal (sem fechar/abrir)
         updateMemberDetailsContent(member, student, graduations, qualifications);
@@ -1773,20 +1759,45 @@ async function deleteMember(memberId = null) {
     }
 }
 
-async function loadStudentsForMemberSelect() {
+async function loadStudentsForMemberSelect(query = '') {
     try {
-        const data = await apiRequest('/students?per_page=1000');
+        // Busca por prefixo do nome (sem acentos), limitada aos primeiros resultados
+        const data = await apiRequest(`/students/lookup?q=${encodeURIComponent(query)}&limit=20`);
         const select = document.getElementById('memberStudentSelect');
+        const selected = select.value;
         
         select.innerHTML = '<option value="">Selecione um Cadastro Básico...</option>';
         data.students.forEach(student => {
             select.innerHTML += `<option value="${student.id}">${student.name} - ${student.registration_number}</option>`;
         });
+        
+        // Manter a seleção atual mesmo que não esteja no resultado da busca
+        if (selected && !data.students.some(student => String(student.id) === selected)) {
+            ensureStudentOption(selected, select.dataset.selectedLabel || selected);
+        }
+        select.value = selected;
     } catch (error) {
         console.error('Error loading students:', error);
     }
 }
 
+let memberStudentSearchTimeout;
+function searchStudentsForMemberSelect() {
+    clearTimeout(memberStudentSearchTimeout);
+    memberStudentSearchTimeout = setTimeout(() => {
+        loadStudentsForMemberSelect(document.getElementById('memberStudentSearch').value);
+    }, 300);
+}
+
+function ensureStudentOption(studentId, label) {
+    // Garante que o Cadastro Básico pré-selecionado exista no seletor
+    const select = document.getElementById('memberStudentSelect');
+    if (!select.querySelector(`option[value="${studentId}"]`)) {
+        select.innerHTML += `<option value="${studentId}">${label}</option>`;
+    }
+    select.dataset.selectedLabel = label;
+}
+
 document.getElementById('memberForm').addEventListener('submit', async (e) => {
     e.preventDefault();
     
@@ -3305,8 +3316,8 @@ async function loadReports() {
         const totalPending = stats.members.without_photo + stats.graduations.without_certificate + stats.qualifications.without_certificate;
         document.getElementById('statTotalPending').textContent = totalPending;
         
-        // Carregar pendências
-        const pending = await apiRequest('/reports/documents/pending');
+        // Carregar pendências (primeira página de cada seção)
+        const pending = await apiRequest(`/reports/documents/pending?per_page=${PENDING_PER_PAGE}`);
         
         // Atualizar badges
         document.getElementById('badgeMembersPending').textContent = pending.statistics.total_members_without_photo;
@@ -3314,9 +3325,14 @@ async function loadReports() {
         document.getElementById('badgeQualsPending').textContent = pending.statistics.total_qualifications_without_certificate;
         
         // Renderizar listas
-        renderMembersPending(pending.members_without_photo);
-        renderGradsPending(pending.graduations_without_certificate);
-        renderQualsPending(pending.qualifications_without_certificate);
+        Object.keys(PENDING_SECTIONS).forEach(section => {
+            pendingState[section] = {
+                items: pending[section],
+                page: 1,
+                total: pending.statistics[`total_${section}`]
+            };
+            renderPendingSection(section);
+        });
         
     } catch (error) {
         showNotification('Erro ao carregar relatórios: ' + error.message, 'error');
@@ -3325,6 +3341,43 @@ async function loadReports() {
     }
 }
 
+// Seções do relatório de pendências: função de renderização e lista
+const PENDING_SECTIONS = {
+    members_without_photo: { render: items => renderMembersPending(items), container: 'membersPendingList' },
+    graduations_without_certificate: { render: items => renderGradsPending(items), container: 'gradsPendingList' },
+    qualifications_without_certificate: { render: items => renderQualsPending(items), container: 'qualsPendingList' }
+};
+const PENDING_PER_PAGE = 50;
+let pendingState = {};
+
+function renderPendingSection(section) {
+    const state = pendingState[section];
+    PENDING_SECTIONS[section].render(state.items);
+    
+    if (state.items.length < state.total) {
+        document.getElementById(PENDING_SECTIONS[section].container).innerHTML += `
+            <div class="text-center pt-2">
+                <button onclick="loadMorePending('${section}')" class="btn-secondary text-white px-4 py-2 rounded-lg text-sm">
+                    <i class="fas fa-chevron-down mr-1"></i>Carregar mais (${state.items.length} de ${state.total})
+                </button>
+            </div>
+        `;
+    }
+}
+
+async function loadMorePending(section) {
+    const state = pendingState[section];
+    try {
+        const data = await apiRequest(`/reports/documents/pending?section=${section}&page=${state.page + 1}&per_page=${PENDING_PER_PAGE}`);
+        state.page += 1;
+        state.items = state.items.concat(data[section]);
+        state.total = data.statistics[`total_${section}`];
+        renderPendingSection(section);
+    } catch (error) {
+        showNotification('Erro ao carregar pendências: ' + error.message, 'error');
+    }
+}
+
 function renderMembersPending(members) {
     const container = document.getElementById('membersPendingList');
     
@@ -8,6 +8,8 @@ let currentCalendarView = 'month';
 let allEvents = [];
 let filteredEvents = [];
 let selectedEventId = null;
+let loadedCalendarYear = null;
+let calendarStream = null;
 
 // =========================================
 // Calendar Initialization
@@ -58,6 +60,44 @@ async function initializeCalendar() {
     
     // Render calendar
     renderCalendar();
+    
+    // Receive changes and reminders pushed by the server
+    connectCalendarStream();
+}
+
+// =========================================
+// Live Updates (Server-Sent Events)
+// =========================================
+
+function connectCalendarStream() {
+    if (calendarStream || !authToken || typeof EventSource === 'undefined') return;
+    
+    // EventSource cannot send headers, so the token goes in the query string
+    calendarStream = new EventSource(`${API_BASE_URL}/events/stream?token=${encodeURIComponent(authToken)}`);
+    
+    calendarStream.addEventListener('calendar', async () => {
+        await loadEvents();
+        renderCalendar();
+        await loadActiveReminders();
+    });
+    
+    calendarStream.addEventListener('reminder', async () => {
+        await loadActiveReminders();
+    });
+    
+    calendarStream.onerror = () => {
+        // Token expired or user logged out: stop reconnecting
+        if (!authToken) {
+            disconnectCalendarStream();
+        }
+    };
+}
+
+function disconnectCalendarStream() {
+    if (calendarStream) {
+        calendarStream.close();
+        calendarStream = null;
+    }
 }
 
 // =========================================
@@ -85,11 +125,16 @@ async function loadEvents() {
         if (dojo) params.append('dojo_id', dojo);
         if (search) params.append('search', search);
         
-        params.append('per_page', '500'); // Get lots of events for calendar view
+        // Load every day the views of this year can display, with recurring events already expanded
+        const year = currentCalendarDate.getFullYear();
+        const range = calendarFetchRange(year);
+        params.append('start', formatLocalDateTime(range.start));
+        params.append('end', formatLocalDateTime(range.end));
         
-        const data = await apiRequest(`/events?${params.toString()}`);
+        const data = await apiRequest(`/events/calendar?${params.toString()}`);
         allEvents = data.events || [];
         filteredEvents = allEvents;
+        loadedCalendarYear = year;
         
         hideLoading();
     } catch (error) {
@@ -99,6 +144,34 @@ async function loadEvents() {
     }
 }
 
+// Days shown by any view while the year is loaded: the January and December
+// month grids and the weeks crossing the year boundary include days of the
+// neighbouring years
+function calendarFetchRange(year) {
+    // Sunday of the first row of the January grid (also the first week)
+    const start = new Date(year, 0, 1);
+    start.setDate(start.getDate() - start.getDay());
+    
+    // End of the 6-week December grid
+    const gridEnd = new Date(year, 11, 1);
+    gridEnd.setDate(gridEnd.getDate() - gridEnd.getDay() + 6 * 7);
+    
+    // End of the week containing December 31 (as filtered by renderWeekList)
+    const weekEnd = new Date(year, 11, 31);
+    weekEnd.setDate(weekEnd.getDate() - weekEnd.getDay() + 8);
+    
+    const end = gridEnd > weekEnd ? gridEnd : weekEnd;
+    end.setMilliseconds(-1);
+    return { start, end };
+}
+
+// Naive local date/time (YYYY-MM-DDTHH:MM:SS), the format stored by the API
+function formatLocalDateTime(date) {
+    const pad = value => String(value).padStart(2, '0');
+    return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}` +
+        `T${pad(date.getHours())}:${pad(date.getMinutes())}:${pad(date.getSeconds())}`;
+}
+
 // =========================================
 // Calendar Rendering
 // =========================================
@@ -414,7 +487,7 @@ function changeCalendarView() {
     renderCalendar();
 }
 
-function previousPeriod() {
+async function previousPeriod() {
     if (currentCalendarView === 'month') {
         currentCalendarDate.setMonth(currentCalendarDate.getMonth() - 1);
     } else if (currentCalendarView === 'week') {
@@ -422,10 +495,13 @@ function previousPeriod() {
     } else if (currentCalendarView === 'year') {
         currentCalendarDate.setFullYear(currentCalendarDate.getFullYear() - 1);
     }
+    if (currentCalendarDate.getFullYear() !== loadedCalendarYear) {
+        await loadEvents();
+    }
     renderCalendar();
 }
 
-function nextPeriod() {
+async function nextPeriod() {
     if (currentCalendarView === 'month') {
         currentCalendarDate.setMonth(currentCalendarDate.getMonth() + 1);
     } else if (currentCalendarView === 'week') {
@@ -433,6 +509,9 @@ function nextPeriod() {
     } else if (currentCalendarView === 'year') {
         currentCalendarDate.setFullYear(currentCalendarDate.getFullYear() + 1);
     }
+    if (currentCalendarDate.getFullYear() !== loadedCalendarYear) {
+        await loadEvents();
+    }
     renderCalendar();
 }
 